@@ -1,17 +1,28 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
+from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import os
+import csv
 import json
+import re
 import asyncio
+import hashlib
+import heapq
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
 import sys
 import traceback
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+from itertools import islice
+from operator import itemgetter
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -28,9 +39,43 @@ logger = logging.getLogger(__name__)
 sys.path.append(str(Path(__file__).parent.parent))
 
 from utils import TikTokJSONProcessor, CSVGenerator, JSONLConverter
-from clients.opus_client import OpusClipClient
+from utils import json_compat
+from utils.state_store import create_state_store
+from clients.opus_client import AsyncOpusClipClient
 
-app = FastAPI(title="BrandVoice API")
+# ijson (preferably the yajl2_c backend) lets us stream large uploads instead of
+# building the whole document in memory; fall back to a full parse without it
+try:
+    import ijson
+    from ijson.common import JSONError as IJSONError
+    try:
+        ijson = ijson.get_backend('yajl2_c')
+    except ImportError:
+        pass
+    INVALID_JSON_ERRORS = (json.JSONDecodeError, IJSONError)
+except ImportError:
+    ijson = None
+    INVALID_JSON_ERRORS = (json.JSONDecodeError,)
+
+# arq runs process_videos in a separate worker (api/worker.py) when Redis is
+# configured; without it jobs run as in-process background tasks
+try:
+    from arq import create_pool
+    from arq.connections import RedisSettings
+except ImportError:
+    create_pool = None
+
+# polars (optional) sums CSV stat columns in its native parser
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# Serialize endpoint responses with orjson when it is installed
+app = FastAPI(
+    title="BrandVoice API",
+    default_response_class=ORJSONResponse if json_compat.orjson is not None else JSONResponse
+)
 
 # Enable CORS
 app.add_middleware(
@@ -41,12 +86,105 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage for jobs (in production, use a database)
-jobs_store = {}
-uploaded_files = {}
+# Job and upload state (Redis when REDIS_URL is set, otherwise SQLite at
+# STATE_DB, or in-memory if STATE_DB is empty)
+state_store = create_state_store()
+job_queue = None
+
+# Without a worker, jobs run inside the server process that accepted them and
+# are tagged with its id. Each process keeps a heartbeat key alive in the
+# (possibly shared) state store, so a 'processing' job whose owner's heartbeat
+# has expired died with that process and can be failed by any other
+server_id = str(uuid.uuid4())
+SERVER_HEARTBEAT_TTL = 60
+SERVER_HEARTBEAT_INTERVAL = 20
+heartbeat_task = None
+
+# Transcript parsing gets its own thread pool, so it never competes with
+# Starlette's threadpool (file I/O). OpusClip calls are async and need no thread.
+transcript_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix='transcript')
+
+@app.on_event("shutdown")
+async def shutdown_executors():
+    transcript_executor.shutdown(wait=False)
+
+@app.on_event("startup")
+async def connect_job_queue():
+    global job_queue
+    redis_url = os.getenv('REDIS_URL')
+    if redis_url and create_pool is not None:
+        job_queue = await create_pool(RedisSettings.from_dsn(redis_url))
+        logger.info("Processing jobs will be queued for the arq worker")
+
+async def fail_interrupted_jobs():
+    """Mark 'processing' jobs whose owning server process is gone as errors."""
+    for key in await state_store.keys('job:'):
+        job = await state_store.get(key)
+        if job is None or job['status'] != 'processing' or not job.get('owner'):
+            continue
+        if job['owner'] == server_id or await state_store.get(f"server:{job['owner']}") is not None:
+            continue
+        job['status'] = 'error'
+        job['error'] = 'Interrupted by a server restart'
+        job['currentPhase'] = 'Interrupted'
+        job['version'] = job.get('version', 0) + 1
+        await state_store.set(key, job)
+        logger.warning(f"Job {job['jobId']} was interrupted by a server restart")
+
+async def keep_server_alive():
+    """Refresh this process's heartbeat and sweep up jobs of dead ones."""
+    while True:
+        try:
+            await state_store.set(f"server:{server_id}", True, ttl=SERVER_HEARTBEAT_TTL)
+            await fail_interrupted_jobs()
+        except Exception as e:
+            logger.warning(f"Server heartbeat failed: {e}")
+        await asyncio.sleep(SERVER_HEARTBEAT_INTERVAL)
+
+@app.on_event("startup")
+async def start_heartbeat():
+    global heartbeat_task
+    if job_queue is None:
+        heartbeat_task = asyncio.create_task(keep_server_alive())
+
+@app.on_event("shutdown")
+async def close_job_queue():
+    if heartbeat_task is not None:
+        heartbeat_task.cancel()
+    if job_queue is not None:
+        await job_queue.close()
+
+# Uploads that are never processed are forgotten after this long, and their
+# files are removed at the next startup
+UPLOAD_TTL = 24 * 3600
+
+def remove_stale_uploads(upload_dir: Path = Path('uploads')):
+    """Delete uploaded files older than UPLOAD_TTL."""
+    cutoff = time.time() - UPLOAD_TTL
+    try:
+        with os.scandir(upload_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+    except FileNotFoundError:
+        pass
+
+@app.on_event("startup")
+async def clean_uploads():
+    await run_in_threadpool(remove_stale_uploads)
+
+async def discard_upload(file_id: Optional[str], file_info: Dict[str, Any]):
+    """Forget a processed upload and delete its file."""
+    if file_id:
+        await state_store.delete(f"upload:{file_id}")
+    try:
+        os.remove(file_info['path'])
+    except FileNotFoundError:
+        pass
 
 class ProcessConfig(BaseModel):
     filename: str
+    fileId: Optional[str] = None  # From /api/upload; filename lookup is the fallback
     videosToProcess: int
     batchSize: int = 10
     parameterMode: str = "auto"
@@ -71,6 +209,235 @@ class VideoStatus(BaseModel):
     opusProjectId: Optional[str] = None
     clipsGenerated: Optional[int] = None
 
+# Model for the auto-mode JSONL parameter analysis, and how long its
+# suggestions are reused for identical sample data
+AI_ANALYSIS_MODEL = os.getenv('OPENAI_ANALYSIS_MODEL', 'gpt-4')
+AI_ANALYSIS_CACHE_TTL = 30 * 24 * 3600
+
+AI_ANALYSIS_SAMPLE = """Video {number}:
+  Description: {description}
+  Hashtags: {hashtags}
+  Transcript: {transcript}..."""
+
+AI_ANALYSIS_PROMPT = """Analyze the following TikTok video data and suggest optimal parameters:
+
+Sample Data:
+{samples}
+
+Suggest:
+1. Primary language (e.g., English, Spanish, etc.)
+2. Optimal max character limit for descriptions (100-300)
+
+Respond in JSON format:
+{{
+  "language": "detected language",
+  "max_char": recommended_number,
+  "reasoning": "brief explanation"
+}}"""
+
+# Fenced ```json block, for replies that wrap the JSON in markdown
+JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
+# OpenAI clients by API key, shared across jobs so analysis calls reuse one
+# connection pool instead of a new TLS handshake per job
+openai_clients = {}
+
+
+def get_openai_client(api_key: str):
+    """Return the process-wide OpenAI client for api_key, creating it on first use."""
+    client = openai_clients.get(api_key)
+    if client is None:
+        from openai import OpenAI
+        client = openai_clients[api_key] = OpenAI(api_key=api_key)
+    return client
+
+def read_csv_sample(csv_path: Path, limit: int) -> List[Dict[str, str]]:
+    """
+    Read the first rows of an output CSV for the AI analysis prompt.
+
+    Only the first `limit` rows are parsed; the rest of the file is never read.
+
+    Args:
+        csv_path: Path to an output CSV file
+        limit: Number of rows to return
+
+    Returns:
+        List of dicts with truncated description, hashtags and transcript
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        # Missing columns point at a padding slot holding ''
+        width = len(header)
+        columns = {name: i for i, name in enumerate(header)}
+        description_col, hashtags_col, transcript_col = (
+            columns.get(name, width) for name in ('description', 'hashtags', 'transcript')
+        )
+        padding = [''] * (width + 1)
+        
+        sample = []
+        for row in islice(reader, limit):
+            if len(row) <= width:
+                row += padding[len(row):]
+            sample.append({
+                'description': row[description_col][:200],
+                'hashtags': row[hashtags_col],
+                'transcript': row[transcript_col][:300]
+            })
+        return sample
+
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Read buffer for files that are read start to finish (the default is 8 KiB)
+FILE_BUFFER_SIZE = 1024 * 1024
+
+# Shared default for optional nested objects, so lookups don't allocate a new dict
+EMPTY_DICT = {}
+
+def get_upload_video_id(video: Dict[str, Any]) -> str:
+    """Get a video's ID from an uploaded item ('id', falling back to 'video.id')."""
+    if 'id' in video:
+        return video['id']
+    return video.get('video', EMPTY_DICT).get('id', '')
+
+def scan_upload_video_ids(file_path: str):
+    """
+    Count the videos in an uploaded JSON file and collect their IDs.
+
+    Videos are read from a top-level list, or from the 'videos' key
+    (falling back to 'itemList') of a top-level object. With ijson
+    installed the file is streamed, so only one video is held at a time.
+
+    Args:
+        file_path: Path to the uploaded JSON file
+
+    Returns:
+        Tuple of (total_videos, video_ids)
+    """
+    if ijson is None:
+        with open(file_path, 'rb') as f:
+            data = json_compat.loads(f.read())
+        videos = []
+        if isinstance(data, dict):
+            videos = data.get('videos', data.get('itemList', []))
+        elif isinstance(data, list):
+            videos = data
+        return len(videos), list(map(get_upload_video_id, videos))
+
+    containers = ('item', 'videos.item', 'itemList.item')
+    ids = {prefix: [] for prefix in containers}
+    top_level = None
+    has_videos_key = False
+    item_id = nested_id = None
+
+    with open(file_path, 'rb') as f:
+        for prefix, event, value in ijson.parse(f, buf_size=FILE_BUFFER_SIZE):
+            if prefix == '':
+                if top_level is None and event in ('start_map', 'start_array'):
+                    top_level = event
+                elif event == 'map_key' and value == 'videos':
+                    has_videos_key = True
+            elif prefix in ids:
+                if event == 'start_map':
+                    item_id = nested_id = None
+                elif event == 'end_map':
+                    ids[prefix].append(item_id if item_id is not None else (nested_id or ''))
+            elif prefix.endswith('.video.id') and prefix[:-len('.video.id')] in ids:
+                nested_id = value
+            elif prefix.endswith('.id') and prefix[:-len('.id')] in ids:
+                item_id = value
+
+    if top_level == 'start_array':
+        video_ids = ids['item']
+    elif has_videos_key:
+        video_ids = ids['videos.item']
+    else:
+        video_ids = ids['itemList.item']
+
+    return len(video_ids), video_ids
+
+# How long an unused channel ID set stays cached
+EXISTING_IDS_TTL = 3600
+
+async def get_existing_video_ids_cached(channel_name: str):
+    """
+    Get the processed video IDs for a channel, caching the set in the state store.
+
+    The cached set is tagged with the number and newest mtime of the channel's
+    CSVs, so any CSV written, touched or removed since (by the API or a CLI
+    run) triggers a rescan.
+
+    Args:
+        channel_name: TikTok channel/username
+
+    Returns:
+        Frozen set of video IDs that have already been processed
+    """
+    csv_entries = await run_in_threadpool(scan_dir_by_mtime, Path('output'), '.csv', f"{channel_name}_")
+    signature = [len(csv_entries), csv_entries[0].stat().st_mtime if csv_entries else 0]
+    
+    cache_key = f"existing:{channel_name}"
+    cached = await state_store.get(cache_key)
+    if cached is not None and cached['signature'] == signature:
+        return frozenset(cached['ids'])
+    
+    existing_ids = await run_in_threadpool(CSVGenerator().get_existing_video_ids, channel_name, 'output')
+    await state_store.set(cache_key, {'signature': signature, 'ids': list(existing_ids)}, ttl=EXISTING_IDS_TTL)
+    return frozenset(existing_ids)
+
+def to_int(value) -> int:
+    """Parse a numeric CSV field, treating blank or malformed values as 0."""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return 0
+
+def batch_chunks(parts, chunk_size: int = 65536):
+    """Join small string fragments into ~chunk_size pieces for a streamed response."""
+    buffer = []
+    buffered = 0
+    for part in parts:
+        buffer.append(part)
+        buffered += len(part)
+        if buffered >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield ''.join(buffer)
+
+class LargeChunkFileResponse(FileResponse):
+    # Read downloads in 1 MiB chunks instead of Starlette's 64 KB default
+    chunk_size = 1024 * 1024
+
+# When set (e.g. "/internal"), downloads are handed to nginx via X-Accel-Redirect
+# so it can serve the file itself with sendfile
+DOWNLOAD_ACCEL_PREFIX = os.getenv('DOWNLOAD_ACCEL_PREFIX', '').rstrip('/')
+
+DOWNLOAD_MEDIA_TYPES = {'.csv': 'text/csv', '.jsonl': 'application/x-ndjson'}
+
+# Single byte range ("bytes=START-END", "bytes=START-" or "bytes=-SUFFIX")
+RANGE_RE = re.compile(r'bytes=(\d*)-(\d*)$')
+
+def iter_file_range(path: Path, start: int, length: int):
+    """
+    Yield `length` bytes of a file starting at `start`, in 1 MiB chunks.
+
+    Args:
+        path: File to read
+        start: Byte offset of the first byte
+        length: Number of bytes to yield
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(LargeChunkFileResponse.chunk_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
 @app.get("/")
 async def root():
     return {"message": "BrandVoice API is running"}
@@ -87,42 +454,32 @@ async def upload_file(file: UploadFile = File(...)):
         
         file_path = upload_dir / f"{file_id}_{file.filename}"
         
-        content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
-        
-        # Parse JSON to get metadata
-        processor = TikTokJSONProcessor()
+        # Copy the upload to disk in 1 MiB chunks so it is never held in memory
+        # whole; writes and parsing run in the threadpool so large uploads
+        # don't stall the event loop (and the progress polls it serves)
+        with open(file_path, 'wb') as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await run_in_threadpool(f.write, chunk)
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Extract video count
-            videos = []
-            if isinstance(data, dict):
-                videos = data.get('videos', data.get('itemList', []))
-            elif isinstance(data, list):
-                videos = data
-            
-            total_videos = len(videos)
+            # Stream the saved file for the count and IDs only (no full video list in memory)
+            total_videos, video_ids = await run_in_threadpool(scan_upload_video_ids, str(file_path))
             
             # Check for existing videos
-            csv_generator = CSVGenerator()
             # Extract channel name from filename (remove .json extension)
             channel_name = file.filename.replace('.json', '')
-            existing_video_ids = csv_generator.get_existing_video_ids(channel_name)
+            existing_video_ids = await get_existing_video_ids_cached(channel_name)
             
-            video_ids = [v.get('id', v.get('video', {}).get('id', '')) for v in videos]
-            existing_count = sum(1 for vid in video_ids if vid in existing_video_ids)
+            # map() keeps the membership loop in C
+            existing_count = sum(map(existing_video_ids.__contains__, video_ids))
             new_count = total_videos - existing_count
             
-            # Store file info
-            uploaded_files[file_id] = {
+            # Store file info (videos are re-read from disk when processing starts)
+            await state_store.set(f"upload:{file_id}", {
                 'filename': file.filename,
-                'path': str(file_path),
-                'videos': videos
-            }
+                'path': str(file_path)
+            }, ttl=UPLOAD_TTL)
+            await state_store.set(f"upload_name:{file.filename}", file_id, ttl=UPLOAD_TTL)
             
             return {
                 "fileId": file_id,
@@ -132,7 +489,7 @@ async def upload_file(file: UploadFile = File(...)):
                 "newVideos": new_count
             }
             
-        except json.JSONDecodeError as e:
+        except INVALID_JSON_ERRORS as e:
             logger.error(f"JSON decode error: {e}")
             raise HTTPException(status_code=400, detail="Invalid JSON file")
             
@@ -145,14 +502,11 @@ async def upload_file(file: UploadFile = File(...)):
 async def start_processing(config: ProcessConfig, background_tasks: BackgroundTasks):
     """Start processing a video job"""
     try:
-        # Find the file by filename
+        # Find the upload by ID, falling back to the latest upload with this filename
         file_info = None
-        file_id = None
-        for fid, info in uploaded_files.items():
-            if info['filename'] == config.filename:
-                file_info = info
-                file_id = fid
-                break
+        file_id = config.fileId or await state_store.get(f"upload_name:{config.filename}")
+        if file_id:
+            file_info = await state_store.get(f"upload:{file_id}")
         
         if not file_info:
             raise HTTPException(status_code=404, detail="File not found")
@@ -161,7 +515,7 @@ async def start_processing(config: ProcessConfig, background_tasks: BackgroundTa
         job_id = str(uuid.uuid4())
         creator_name = config.filename.replace('.json', '').replace('input/', '')
         
-        jobs_store[job_id] = {
+        await state_store.set(f"job:{job_id}", {
             'jobId': job_id,
             'creatorName': creator_name,
             'status': 'processing',
@@ -169,12 +523,19 @@ async def start_processing(config: ProcessConfig, background_tasks: BackgroundTa
             'currentPhase': 'Initializing',
             'videos': [],
             'config': config.model_dump(),
+            'fileId': file_id,
             'fileInfo': file_info,
-            'createdAt': datetime.now().isoformat()
-        }
-        
-        # Start background processing
-        background_tasks.add_task(process_videos, job_id)
+            'createdAt': datetime.now().isoformat(),
+            'owner': server_id if job_queue is None else None,
+            'version': 0
+        })
+        
+        # Hand off to the worker if one is configured, otherwise run in-process.
+        # The arq job id is the job id, so a repeated enqueue is a no-op.
+        if job_queue is not None:
+            await job_queue.enqueue_job('process_videos', job_id, _job_id=job_id)
+        else:
+            background_tasks.add_task(process_videos, job_id)
         
         return {
             "job_id": job_id,
@@ -187,11 +548,22 @@ async def start_processing(config: ProcessConfig, background_tasks: BackgroundTa
 
 async def process_videos(job_id: str):
     """Background task to process videos - performs all the same steps as main.py"""
-    job = jobs_store[job_id]
+    job_key = f"job:{job_id}"
+    job = await state_store.get(job_key)
+    if job is None or job['status'] != 'processing':
+        # Unknown job, or a redelivered job that already finished
+        return
     config = job['config']
     file_info = job['fileInfo']
     start_time = datetime.now()
     
+    async def save():
+        # Publish the current job state so progress polls (from any worker) see it;
+        # the version lets pollers reuse a cached response until something changes
+        job['version'] = job.get('version', 0) + 1
+        await state_store.set(job_key, job)
+    
+    opus_client = None
     try:
         # Initialize processors
         processor = TikTokJSONProcessor()
@@ -202,14 +574,16 @@ async def process_videos(job_id: str):
         if not opus_api_key:
             raise Exception("OPUSCLIP_API_KEY not found in environment variables")
         
-        opus_client = OpusClipClient(api_key=opus_api_key)
+        # One connection pool for all of this job's OpusClip requests
+        opus_client = AsyncOpusClipClient(api_key=opus_api_key)
         
         # STEP 1: Parse videos from JSON
         job['currentPhase'] = 'Parsing videos from JSON'
         job['progress'] = 5
+        await save()
         
         # Process the JSON file to get structured video data
-        videos = processor.process_json_file(file_info['path'])
+        videos = await run_in_threadpool(processor.process_json_file, file_info['path'])
         
         if not videos:
             raise Exception("No videos found in JSON file")
@@ -223,19 +597,14 @@ async def process_videos(job_id: str):
         # STEP 2: Deduplicate - check for existing videos
         job['currentPhase'] = 'Checking for duplicate videos'
         job['progress'] = 10
+        await save()
         
         channel_name = file_info['filename'].replace('.json', '')
-        existing_video_ids = csv_generator.get_existing_video_ids(channel_name, 'output')
+        existing_video_ids = await get_existing_video_ids_cached(channel_name)
         
-        # Filter out existing videos
-        new_videos = []
-        skipped_videos = []
-        for video in videos:
-            video_id = video['video_id']
-            if video_id in existing_video_ids:
-                skipped_videos.append(video)
-            else:
-                new_videos.append(video)
+        # Filter out existing videos (only the number skipped is needed)
+        new_videos = [video for video in videos if video['video_id'] not in existing_video_ids]
+        skipped_count = len(videos) - len(new_videos)
         
         if not new_videos:
             job['status'] = 'completed'
@@ -243,12 +612,14 @@ async def process_videos(job_id: str):
             job['currentPhase'] = 'Complete - All videos already processed'
             job['summary'] = {
                 'processed': 0,
-                'skipped': len(skipped_videos),
+                'skipped': skipped_count,
                 'totalTime': str(datetime.now() - start_time)
             }
+            await save()
+            await discard_upload(job.get('fileId'), file_info)
             return
         
-        logger.info(f"Processing {len(new_videos)} new videos, skipping {len(skipped_videos)} duplicates")
+        logger.info(f"Processing {len(new_videos)} new videos, skipping {skipped_count} duplicates")
         
         total = len(new_videos)
         job['videos'] = []
@@ -256,48 +627,50 @@ async def process_videos(job_id: str):
         # STEP 3: Submit projects to OpusClip
         job['currentPhase'] = f'Submitting {total} projects to OpusClip'
         job['progress'] = 15
+        await save()
         
-        project_submissions = []
         batch_size = config.get('batchSize', 10)
+        submit_semaphore = asyncio.Semaphore(batch_size)
+        submitted_count = 0
         
-        for i in range(0, len(new_videos), batch_size):
-            batch = new_videos[i:i + batch_size]
+        async def submit_one(video):
+            nonlocal submitted_count
+            video_id = video['video_id']
+            video_url = video['video_url']
             
-            for video in batch:
-                video_id = video['video_id']
-                video_url = video['video_url']
-                
-                # Create video status entry
-                video_status = {
-                    'id': video_id,
-                    'title': video.get('description', 'Untitled')[:50],
-                    'status': 'processing',
-                    'currentStep': 'Submitting to OpusClip',
-                    'description': video.get('description', ''),
-                    'viewCount': video.get('view_count', 0),
-                    'likeCount': video.get('like_count', 0),
-                    'commentCount': video.get('comment_count', 0),
-                    'duration': video.get('duration', 0),
-                    'steps': {
-                        'metadata': 'completed',
-                        'submission': 'processing',
-                        'transcript': 'pending',
-                        'csv': 'pending'
-                    }
+            # Create video status entry
+            video_status = {
+                'id': video_id,
+                'title': video.get('description', 'Untitled')[:50],
+                'status': 'processing',
+                'currentStep': 'Submitting to OpusClip',
+                'description': video.get('description', ''),
+                'viewCount': video.get('view_count', 0),
+                'likeCount': video.get('like_count', 0),
+                'commentCount': video.get('comment_count', 0),
+                'duration': video.get('duration', 0),
+                'steps': {
+                    'metadata': 'completed',
+                    'submission': 'processing',
+                    'transcript': 'pending',
+                    'csv': 'pending'
                 }
-                job['videos'].append(video_status)
-                
+            }
+            job['videos'].append(video_status)
+            
+            # At most batch_size submissions are in flight at once
+            async with submit_semaphore:
                 try:
                     # Submit project to OpusClip
-                    project_response = opus_client.submit_project(video_url)
+                    project_response = await opus_client.submit_project(video_url)
                     project_id = project_response.get('projectId')
                     
                     if project_id:
                         video['project_id'] = project_id
                         video_status['opusProjectId'] = project_id
                         video_status['steps']['submission'] = 'completed'
-                        project_submissions.append((video, video_status))
                         logger.info(f"✅ Submitted {video_id} → Project {project_id}")
+                        return video, video_status
                     else:
                         video_status['status'] = 'failed'
                         video_status['steps']['submission'] = 'failed'
@@ -309,6 +682,17 @@ async def process_videos(job_id: str):
                     video_status['steps']['submission'] = 'failed'
                     video_status['currentStep'] = f'Error: {str(e)}'
                     logger.error(f"❌ Error submitting {video_id}: {e}")
+                
+                finally:
+                    submitted_count += 1
+                    job['progress'] = 15 + (5 * submitted_count) // total
+                    await save()
+            
+            return None
+        
+        # Submit concurrently; results come back in the original video order
+        submissions = await asyncio.gather(*[submit_one(video) for video in new_videos])
+        project_submissions = [s for s in submissions if s is not None]
         
         if not project_submissions:
             raise Exception("No projects submitted successfully")
@@ -317,6 +701,7 @@ async def process_videos(job_id: str):
         
         # STEP 4: Wait for projects and extract transcripts
         job['currentPhase'] = f'Processing {len(project_submissions)} videos (this may take 5-10 min per video)'
+        await save()
         
         async def wait_and_extract(video_tuple):
             video, video_status = video_tuple
@@ -329,15 +714,10 @@ async def process_videos(job_id: str):
                 
                 video_status['currentStep'] = 'Waiting for OpusClip processing'
                 video_status['steps']['transcript'] = 'processing'
+                await save()
                 
-                # Wait for completion
-                loop = asyncio.get_event_loop()
-                completed = await loop.run_in_executor(
-                    None,
-                    opus_client.wait_for_project_completion,
-                    project_id,
-                    600  # 10 minute timeout
-                )
+                # Wait for completion (10 minute timeout)
+                completed = await opus_client.wait_for_project_completion(project_id, 600)
                 
                 if not completed:
                     video_status['status'] = 'failed'
@@ -348,7 +728,7 @@ async def process_videos(job_id: str):
                 
                 # Get exportable clips
                 video_status['currentStep'] = 'Extracting transcript from clips'
-                exportable_clips = opus_client.get_exportable_clips(project_id)
+                exportable_clips = await opus_client.get_exportable_clips(project_id)
                 
                 if not exportable_clips:
                     video_status['status'] = 'failed'
@@ -370,7 +750,9 @@ async def process_videos(job_id: str):
                     logger.warning(f"⚠️ No screenplay in clip for project {project_id}")
                     return None
                 
-                transcript = opus_client.extract_enhanced_transcript_from_screenplay(screenplay)
+                transcript = await asyncio.get_event_loop().run_in_executor(
+                    transcript_executor, opus_client.extract_enhanced_transcript_from_screenplay, screenplay
+                )
                 
                 if transcript:
                     video['transcript'] = transcript
@@ -394,9 +776,20 @@ async def process_videos(job_id: str):
                 video_status['currentStep'] = f'Error: {str(e)[:50]}'
                 logger.error(f"❌ Error processing {video.get('video_id')}: {e}")
                 return None
+            finally:
+                await save()
         
-        # Process all videos in parallel
-        tasks = [wait_and_extract(vt) for vt in project_submissions]
+        # Wait on at most batch_size projects at once, which keeps the number
+        # of projects being polled (and OpusClip's load) bounded
+        wait_semaphore = asyncio.Semaphore(batch_size)
+        
+        async def wait_and_extract_bounded(video_tuple):
+            video_tuple[1]['currentStep'] = 'Queued for OpusClip processing'
+            async with wait_semaphore:
+                return await wait_and_extract(video_tuple)
+        
+        # Process videos in parallel
+        tasks = [wait_and_extract_bounded(vt) for vt in project_submissions]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Filter out None and exceptions
@@ -418,6 +811,7 @@ async def process_videos(job_id: str):
         
         # STEP 5: Generate CSV file
         job['currentPhase'] = 'Generating CSV file'
+        await save()
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         csv_filename = f"{job['creatorName']}_{timestamp}.csv"
@@ -425,13 +819,24 @@ async def process_videos(job_id: str):
         output_dir.mkdir(exist_ok=True)
         csv_path = output_dir / csv_filename
         
-        csv_generator.generate_csv(videos_with_transcripts, str(csv_path))
+        # What the recent-creators index looks like before this job's files
+        # land, so it is only patched in place if it was current
+        index_signature = await run_in_threadpool(recent_creators_signature)
+        await run_in_threadpool(csv_generator.generate_csv, videos_with_transcripts, str(csv_path))
+        await state_store.delete(f"existing:{channel_name}")
         logger.info(f"✅ Generated CSV: {csv_path}")
         
+        # Transcripts are in the CSV now; don't keep them in the stored job too
+        # (the results view fetches them from /api/transcript on demand)
+        job['csvFilename'] = csv_filename
+        for video_status in job['videos']:
+            video_status.pop('transcript', None)
+        
         job['progress'] = 80
         
         # STEP 6: AI Analysis for JSONL parameters
         job['currentPhase'] = 'Analyzing content with AI'
+        await save()
         
         suggested_language = config['language']
         suggested_max_char = config['maxChar']
@@ -439,61 +844,49 @@ async def process_videos(job_id: str):
         # Only run AI analysis if in auto mode
         if config['parameterMode'] == 'auto':
             try:
-                from openai import OpenAI
                 openai_api_key = os.getenv('OPENAI_API_KEY')
                 
                 if openai_api_key:
                     # Read sample of CSV data
-                    import csv
-                    sample_data = []
-                    with open(csv_path, 'r', encoding='utf-8') as f:
-                        reader = csv.DictReader(f)
-                        for i, row in enumerate(reader):
-                            if i >= 5:
-                                break
-                            sample_data.append({
-                                'description': row.get('description', '')[:200],
-                                'hashtags': row.get('hashtags', ''),
-                                'transcript': row.get('transcript', '')[:300]
-                            })
+                    sample_data = await run_in_threadpool(read_csv_sample, csv_path, 5)
                     
                     if sample_data:
                         # Prepare prompt
-                        newline = '\n'
-                        sample_text = newline.join([f"Video {i+1}:{newline}  Description: {v['description']}{newline}  Hashtags: {v['hashtags']}{newline}  Transcript: {v['transcript'][:150]}..." for i, v in enumerate(sample_data)])
-                        
-                        prompt = f"""Analyze the following TikTok video data and suggest optimal parameters:
-
-Sample Data:
-{sample_text}
-
-Suggest:
-1. Primary language (e.g., English, Spanish, etc.)
-2. Optimal max character limit for descriptions (100-300)
-
-Respond in JSON format:
-{{
-  "language": "detected language",
-  "max_char": recommended_number,
-  "reasoning": "brief explanation"
-}}"""
-                        
-                        client = OpenAI(api_key=openai_api_key)
-                        response = client.chat.completions.create(
-                            model="gpt-4",
-                            max_tokens=1024,
-                            messages=[{"role": "user", "content": prompt}]
+                        sample_text = '\n'.join(
+                            AI_ANALYSIS_SAMPLE.format(number=i + 1, description=v['description'],
+                                                      hashtags=v['hashtags'], transcript=v['transcript'][:150])
+                            for i, v in enumerate(sample_data)
                         )
+                        prompt = AI_ANALYSIS_PROMPT.format(samples=sample_text)
                         
-                        response_text = response.choices[0].message.content
+                        # Same samples and model give the same suggestion, so reuse it
+                        cache_key = "ai_params:" + hashlib.blake2b(
+                            f"{AI_ANALYSIS_MODEL}\n{prompt}".encode('utf-8'), digest_size=16
+                        ).hexdigest()
+                        response_json = await state_store.get(cache_key)
                         
-                        # Parse JSON response
-                        import re
-                        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-                        if json_match:
-                            response_json = json.loads(json_match.group(1))
-                        else:
-                            response_json = json.loads(response_text)
+                        if response_json is None:
+                            client = get_openai_client(openai_api_key)
+                            response = await run_in_threadpool(
+                                client.chat.completions.create,
+                                model=AI_ANALYSIS_MODEL,
+                                max_tokens=1024,
+                                response_format={"type": "json_object"},
+                                messages=[{"role": "user", "content": prompt}]
+                            )
+                            
+                            response_text = response.choices[0].message.content
+                            
+                            # Parse JSON response (JSON mode returns bare JSON)
+                            try:
+                                response_json = json_compat.loads(response_text)
+                            except json.JSONDecodeError:
+                                json_match = JSON_BLOCK_RE.search(response_text)
+                                if not json_match:
+                                    raise
+                                response_json = json_compat.loads(json_match.group(1))
+                            
+                            await state_store.set(cache_key, response_json, ttl=AI_ANALYSIS_CACHE_TTL)
                         
                         suggested_language = response_json.get('language', suggested_language)
                         suggested_max_char = response_json.get('max_char', suggested_max_char)
@@ -506,6 +899,7 @@ Respond in JSON format:
         
         # STEP 7: Convert to JSONL training data
         job['currentPhase'] = 'Converting to JSONL training data'
+        await save()
         
         converter = JSONLConverter(
             language=suggested_language,
@@ -518,14 +912,29 @@ Respond in JSON format:
         jsonl_filename = f"{job['creatorName']}_{timestamp}.jsonl"
         jsonl_path = jsonl_dir / jsonl_filename
         
-        num_examples = converter.convert_csv_to_jsonl(str(csv_path), str(jsonl_path))
+        num_examples = await run_in_threadpool(converter.convert_csv_to_jsonl, str(csv_path), str(jsonl_path))
         logger.info(f"✅ Generated JSONL: {jsonl_path} ({num_examples} examples)")
         
+        # Keep the recent-creators index current without a full rescan; an
+        # index that was already stale is dropped for the next read to rebuild
+        stored = await state_store.get('recent_creators')
+        if stored is not None and stored.get('signature') != index_signature:
+            await state_store.delete('recent_creators')
+        elif stored is not None:
+            try:
+                index = stored['creators']
+                await run_in_threadpool(index_creator_csv, index, csv_path, jsonl_path)
+                signature = await run_in_threadpool(recent_creators_signature)
+                await state_store.set('recent_creators', {'signature': signature, 'creators': index}, ttl=RECENT_CREATORS_TTL)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not update recent creators index: {e}")
+                await state_store.delete('recent_creators')
+        recent_creators_response.clear()
+        
         # STEP 8: Complete
         job['status'] = 'completed'
         job['progress'] = 100
         job['currentPhase'] = 'Complete'
-        job['csvFilename'] = csv_filename
         job['jsonlFilename'] = jsonl_filename
         
         elapsed_time = datetime.now() - start_time
@@ -535,10 +944,12 @@ Respond in JSON format:
         
         job['summary'] = {
             'processed': len(videos_with_transcripts),
-            'skipped': len(skipped_videos),
+            'skipped': skipped_count,
             'totalTime': time_str,
             'trainingExamples': num_examples
         }
+        await save()
+        await discard_upload(job.get('fileId'), file_info)
         
         logger.info(f"✅ Job {job_id} completed successfully in {time_str}")
         
@@ -546,18 +957,39 @@ Respond in JSON format:
         job['status'] = 'error'
         job['error'] = str(e)
         job['currentPhase'] = f'Error: {str(e)}'
+        await save()
         logger.error(f"❌ Error processing job {job_id}: {e}")
         logger.error(traceback.format_exc())
+    finally:
+        if opus_client is not None:
+            await opus_client.aclose()
+
+# Serialized /api/progress bodies by job id: (job version, JSON bytes)
+PROGRESS_CACHE_SIZE = 256
+progress_cache = OrderedDict()
 
 @app.get("/api/progress/{job_id}")
-async def get_progress(job_id: str):
+async def get_progress(job_id: str, request: Request):
     """Get job progress"""
-    if job_id not in jobs_store:
+    job = await state_store.get(f"job:{job_id}")
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs_store[job_id]
+    # The job version changes on every save, so it identifies the response body
+    version = job.get('version', 0)
+    etag = f'"{job_id}-{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers=headers)
     
-    return {
+    # The videos list makes this response large, so reuse the serialized body
+    # until the job is saved again
+    cached = progress_cache.get(job_id)
+    if cached is not None and cached[0] == version:
+        progress_cache.move_to_end(job_id)
+        return Response(content=cached[1], media_type="application/json", headers=headers)
+    
+    body = json_compat.dumps({
         "jobId": job_id,
         "status": job['status'],
         "progress": job['progress'],
@@ -568,90 +1000,297 @@ async def get_progress(job_id: str):
         "csvFilename": job.get('csvFilename'),
         "jsonlFilename": job.get('jsonlFilename'),
         "estimatedTimeRemaining": "45 minutes"
+    })
+    progress_cache[job_id] = (version, body)
+    progress_cache.move_to_end(job_id)
+    if len(progress_cache) > PROGRESS_CACHE_SIZE:
+        progress_cache.popitem(last=False)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# The recent-creators index is stored with the recent_creators_signature() it
+# was built against and rebuilt whenever that changes (CSVs written by the CLI,
+# deleted or replaced); the TTL only lets an unused index expire
+RECENT_CREATORS_TTL = 3600
+
+# The /api/recent-creators response is also kept in this process for a short
+# time, keyed on the same recent_creators_signature() as the stored index, so
+# polling doesn't reload and re-sort the index but never outlives it
+RECENT_CREATORS_RESPONSE_TTL = 30
+recent_creators_response = {}
+
+def output_dirs_signature():
+    """Return the mtimes of the output and training_data directories (0 if missing)."""
+    signature = []
+    for directory in ('output', 'training_data'):
+        try:
+            signature.append(os.stat(directory).st_mtime_ns)
+        except FileNotFoundError:
+            signature.append(0)
+    return tuple(signature)
+
+def scan_dir_by_mtime(directory: Path, suffix: str, prefix: str = ''):
+    """
+    List files in a directory, newest first.
+
+    Uses os.scandir so each file is stat'ed once; DirEntry caches the
+    result for later .stat() calls.
+
+    Args:
+        directory: Directory to scan
+        suffix: Required filename suffix (e.g. '.csv')
+        prefix: Required filename prefix
+
+    Returns:
+        List of os.DirEntry sorted by modification time, newest first
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = [
+                e for e in it
+                if e.name.endswith(suffix) and e.name.startswith(prefix)
+                and not e.name.startswith('.') and e.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    return entries
+
+def recent_creators_signature():
+    """
+    Fingerprint the files the recent-creators index is built from.
+
+    The directory mtimes change when a file is added, removed or renamed;
+    the newest CSV's mtime also catches a CSV rewritten in place.
+
+    Returns:
+        List of [output mtime, training_data mtime, newest CSV mtime] in ns
+    """
+    csv_entries = scan_dir_by_mtime(Path('output'), '.csv')
+    newest_csv = csv_entries[0].stat().st_mtime_ns if csv_entries else 0
+    return [*output_dirs_signature(), newest_csv]
+
+def count_lines(path: Path) -> int:
+    """
+    Count the lines in a file without decoding it.
+
+    Reads 1 MiB blocks and counts b'\n' in C; a final line without a
+    trailing newline is counted too, matching iteration over the file.
+
+    Args:
+        path: Path to a text file
+
+    Returns:
+        Number of lines
+    """
+    lines = 0
+    last = b''
+    with open(path, 'rb') as f:
+        while chunk := f.read(FILE_BUFFER_SIZE):
+            lines += chunk.count(b'\n')
+            last = chunk
+    if last and not last.endswith(b'\n'):
+        lines += 1
+    return lines
+
+def count_nonblank_lines(path: Path) -> int:
+    """Count the lines in a file that aren't blank or whitespace-only, without decoding it."""
+    with open(path, 'rb', buffering=FILE_BUFFER_SIZE) as f:
+        return sum(1 for line in f if not line.isspace())
+
+def count_csv_videos(csv_path: Path) -> int:
+    """Count the data lines in a CSV file (excluding the header)."""
+    return max(0, count_lines(csv_path) - 1)
+
+def summarize_csv(csv_path: Path):
+    """
+    Count the rows of a CSV file and sum its view and like counts.
+
+    Only the two count columns are parsed; rows are never built as dicts.
+
+    Args:
+        csv_path: Path to an output CSV file
+
+    Returns:
+        Tuple of (row_count, total_views, total_likes)
+    """
+    if pl is not None:
+        try:
+            # Read the two columns as text and cast, so malformed values count as 0
+            totals = (
+                pl.scan_csv(csv_path, infer_schema_length=0)
+                .select(pl.len(), pl.col('view_count', 'like_count').cast(pl.Int64, strict=False).sum())
+                .collect()
+            )
+            row_count, total_views, total_likes = totals.row(0)
+            return row_count, total_views, total_likes
+        except Exception:
+            pass  # e.g. a missing column; use the csv module below
+    
+    row_count = 0
+    total_views = 0
+    total_likes = 0
+    with open(csv_path, 'r', encoding='utf-8', newline='', buffering=FILE_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        view_col = header.index('view_count') if 'view_count' in header else None
+        like_col = header.index('like_count') if 'like_count' in header else None
+        for row in reader:
+            if not row:
+                continue  # DictReader skips blank lines too
+            row_count += 1
+            if view_col is not None and view_col < len(row):
+                total_views += to_int(row[view_col])
+            if like_col is not None and like_col < len(row):
+                total_likes += to_int(row[like_col])
+    return row_count, total_views, total_likes
+
+def sum_csv_stats(csv_path: Path):
+    """
+    Sum the view and like counts of a CSV file.
+
+    Args:
+        csv_path: Path to an output CSV file
+
+    Returns:
+        Tuple of (total_views, total_likes)
+    """
+    _, total_views, total_likes = summarize_csv(csv_path)
+    return total_views, total_likes
+
+def build_recent_creators_index():
+    """
+    Scan the output directory and summarize every creator.
+
+    Returns:
+        Dict of creator key (CSV filename prefix) to creator summary, with the
+        latest CSV's mtime under 'latestMtime' for ordering
+    """
+    index = {}
+    output_dir = Path('output')
+    training_dir = Path('training_data')
+    
+    csv_entries = scan_dir_by_mtime(output_dir, '.csv')
+    if not csv_entries:
+        return index
+    
+    # One directory listing instead of an exists() check per CSV
+    jsonl_names = {e.name for e in scan_dir_by_mtime(training_dir, '.jsonl')}
+    
+    # Group by creator name
+    for entry in csv_entries:
+        csv_file = output_dir / entry.name
+        name_parts = csv_file.stem.split('_')
+        if len(name_parts) < 2:
+            continue
+        creator_name = name_parts[0]
+        
+        if creator_name not in index:
+            # First file seen is the latest, since sorted by modification time
+            jsonl_name = f"{csv_file.stem}.jsonl"
+            index[creator_name] = {
+                'name': creator_name.title(),
+                'videoCount': 0,
+                'csvFilename': csv_file.name,
+                'jsonlFilename': jsonl_name if jsonl_name in jsonl_names else None,
+                'stats': {
+                    'totalViews': 0,
+                    'totalLikes': 0
+                },
+                'latestMtime': entry.stat().st_mtime
+            }
+            
+            # Calculate actual views and likes from latest CSV
+            try:
+                total_views, total_likes = sum_csv_stats(csv_file)
+                index[creator_name]['stats'] = {
+                    'totalViews': total_views,
+                    'totalLikes': total_likes
+                }
+            except Exception as e:
+                logger.error(f"Error reading stats from {csv_file.name}: {e}")
+        
+        # Count videos in CSV
+        try:
+            index[creator_name]['videoCount'] += count_csv_videos(csv_file)
+        except Exception:
+            pass
+    
+    return index
+
+def index_creator_csv(index: Dict[str, Any], csv_path: Path, jsonl_path: Path):
+    """
+    Record a newly written CSV in the recent-creators index.
+
+    Args:
+        index: Index from build_recent_creators_index (updated in place)
+        csv_path: Path to the new output CSV
+        jsonl_path: Path to the matching JSONL file
+    """
+    name_parts = csv_path.stem.split('_')
+    if len(name_parts) < 2:
+        return
+    creator_name = name_parts[0]
+    
+    entry = index.setdefault(creator_name, {
+        'name': creator_name.title(),
+        'videoCount': 0
+    })
+    total_views, total_likes = sum_csv_stats(csv_path)
+    entry['videoCount'] += count_csv_videos(csv_path)
+    entry['csvFilename'] = csv_path.name
+    entry['jsonlFilename'] = jsonl_path.name if jsonl_path.exists() else None
+    entry['stats'] = {
+        'totalViews': total_views,
+        'totalLikes': total_likes
     }
+    entry['latestMtime'] = csv_path.stat().st_mtime
+
+async def get_recent_creators_index():
+    """
+    Get the recent-creators index from the state store.
+
+    The index is rebuilt from disk if it is missing or the output files have
+    changed since it was stored.
+    """
+    signature = await run_in_threadpool(recent_creators_signature)
+    stored = await state_store.get('recent_creators')
+    if stored is not None and stored.get('signature') == signature:
+        return stored['creators']
+    
+    index = await run_in_threadpool(build_recent_creators_index)
+    await state_store.set('recent_creators', {'signature': signature, 'creators': index}, ttl=RECENT_CREATORS_TTL)
+    return index
 
 @app.get("/api/recent-creators")
 async def get_recent_creators():
     """Get recent creators from output directory"""
     try:
-        creators = []
-        output_dir = Path('output')
-        training_dir = Path('training_data')
-        
-        if output_dir.exists():
-            csv_files = sorted(list(output_dir.glob('*.csv')), key=lambda x: x.stat().st_mtime, reverse=True)
-            
-            # Group by creator name
-            creator_data = {}
-            for csv_file in csv_files:
-                name_parts = csv_file.stem.split('_')
-                if len(name_parts) >= 2:
-                    creator_name = name_parts[0]
-                    
-                    if creator_name not in creator_data:
-                        creator_data[creator_name] = {
-                            'name': creator_name.title(),
-                            'videoCount': 0,
-                            'csvFiles': [],
-                            'jsonlFiles': [],
-                            'latestCsv': None,
-                            'latestJsonl': None
-                        }
-                    
-                    # Count videos in CSV
-                    try:
-                        with open(csv_file, 'r', encoding='utf-8') as f:
-                            lines = f.readlines()
-                            video_count = max(0, len(lines) - 1)  # Exclude header
-                            creator_data[creator_name]['videoCount'] += video_count
-                    except:
-                        pass
-                    
-                    creator_data[creator_name]['csvFiles'].append(csv_file.name)
-                    
-                    # Find matching JSONL file
-                    jsonl_file = training_dir / f"{csv_file.stem}.jsonl"
-                    if jsonl_file.exists():
-                        creator_data[creator_name]['jsonlFiles'].append(jsonl_file.name)
-                    
-                    # Set latest files (first one since sorted by modification time)
-                    if creator_data[creator_name]['latestCsv'] is None:
-                        creator_data[creator_name]['latestCsv'] = csv_file.name
-                        if jsonl_file.exists():
-                            creator_data[creator_name]['latestJsonl'] = jsonl_file.name
-            
-            # Convert to list and calculate real stats
-            import csv as csv_module
-            for creator_name, data in creator_data.items():
-                # Calculate actual views and likes from latest CSV
-                total_views = 0
-                total_likes = 0
-                if data['latestCsv']:
-                    try:
-                        csv_path = output_dir / data['latestCsv']
-                        with open(csv_path, 'r', encoding='utf-8') as f:
-                            reader = csv_module.DictReader(f)
-                            for row in reader:
-                                try:
-                                    total_views += int(row.get('view_count', 0) or 0)
-                                    total_likes += int(row.get('like_count', 0) or 0)
-                                except (ValueError, TypeError):
-                                    pass
-                    except Exception as e:
-                        logger.error(f"Error reading stats from {data['latestCsv']}: {e}")
-                
-                creators.append({
-                    'name': data['name'],
-                    'videoCount': data['videoCount'],
-                    'csvFilename': data['latestCsv'],
-                    'jsonlFilename': data['latestJsonl'],
-                    'stats': {
-                        'totalViews': total_views,
-                        'totalLikes': total_likes
-                    }
-                })
+        signature = await run_in_threadpool(recent_creators_signature)
+        cached = recent_creators_response
+        if cached.get('signature') == signature and cached['expires_at'] > time.monotonic():
+            return {"creators": cached['creators']}
+        
+        index = await get_recent_creators_index()
+        
+        latest = heapq.nlargest(10, index.values(), key=itemgetter('latestMtime'))
+        creators = [
+            {
+                'name': data['name'],
+                'videoCount': data['videoCount'],
+                'csvFilename': data['csvFilename'],
+                'jsonlFilename': data['jsonlFilename'],
+                'stats': data['stats']
+            }
+            for data in latest  # Top 10
+        ]
         
-        return {"creators": creators[:10]}  # Return top 10
+        recent_creators_response.update(
+            signature=signature,
+            expires_at=time.monotonic() + RECENT_CREATORS_RESPONSE_TTL,
+            creators=creators
+        )
+        return {"creators": creators}
         
     except Exception as e:
         logger.error(f"Error getting recent creators: {e}")
@@ -665,34 +1304,60 @@ async def get_creator_details(creator_name: str):
         output_dir = Path('output')
         training_dir = Path('training_data')
         
-        # Find CSV files for this creator
-        csv_files = sorted(
-            [f for f in output_dir.glob(f"{creator_name.lower()}_*.csv")],
-            key=lambda x: x.stat().st_mtime,
-            reverse=True
-        )
+        # Latest CSV comes from the recent-creators index; scan only if it isn't
+        # indexed or the indexed file has changed since (so may not be newest)
+        latest_csv = None
+        index = await get_recent_creators_index()
+        entry = index.get(creator_name.lower())
+        if entry and entry.get('csvFilename'):
+            indexed_csv = output_dir / entry['csvFilename']
+            try:
+                if indexed_csv.stat().st_mtime == entry['latestMtime']:
+                    latest_csv = indexed_csv
+            except FileNotFoundError:
+                pass
         
-        if not csv_files:
-            raise HTTPException(status_code=404, detail="Creator not found")
+        if latest_csv is None:
+            csv_entries = scan_dir_by_mtime(output_dir, '.csv', prefix=f"{creator_name.lower()}_")
+            
+            if not csv_entries:
+                raise HTTPException(status_code=404, detail="Creator not found")
+            
+            latest_csv = output_dir / csv_entries[0].name
         
-        latest_csv = csv_files[0]
         latest_jsonl = training_dir / f"{latest_csv.stem}.jsonl"
         
         # Read video data from CSV
-        import csv
         videos = []
-        with open(latest_csv, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        with open(latest_csv, 'r', encoding='utf-8', buffering=FILE_BUFFER_SIZE) as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            
+            # Column positions; missing columns point at a padding slot holding ''
+            width = len(header)
+            columns = {name: i for i, name in enumerate(header)}
+            id_col, description_col, transcript_col, view_col, like_col, comment_col, duration_col = (
+                columns.get(name, width) for name in
+                ('video_id', 'description', 'transcript', 'view_count', 'like_count', 'comment_count', 'duration')
+            )
+            padding = [''] * (width + 1)
+            has_description = 'description' in columns
+            
             for row in reader:
+                if not row:
+                    continue  # blank line
+                if len(row) <= width:
+                    row += padding[len(row):]
+                transcript = row[transcript_col]
                 videos.append({
-                    'id': row.get('video_id', ''),
-                    'title': row.get('description', 'Untitled')[:100],
-                    'viewCount': int(row.get('view_count', 0)) if row.get('view_count', '').isdigit() else 0,
-                    'likeCount': int(row.get('like_count', 0)) if row.get('like_count', '').isdigit() else 0,
-                    'commentCount': int(row.get('comment_count', 0)) if row.get('comment_count', '').isdigit() else 0,
-                    'duration': int(row.get('duration', 0)) if row.get('duration', '').isdigit() else 0,
-                    'transcript': row.get('transcript', ''),
-                    'transcriptLength': len(row.get('transcript', ''))
+                    'id': row[id_col],
+                    'title': row[description_col][:100] if has_description else 'Untitled',
+                    'viewCount': to_int(row[view_col]),
+                    'likeCount': to_int(row[like_col]),
+                    'commentCount': to_int(row[comment_col]),
+                    'duration': to_int(row[duration_col]),
+                    'transcript': transcript,
+                    'transcriptLength': len(transcript)
                 })
         
         return {
@@ -715,8 +1380,8 @@ async def get_creator_details(creator_name: str):
         raise HTTPException(status_code=500, detail=f"Error getting creator details: {str(e)}")
 
 @app.get("/api/download/{filename}")
-async def download_file(filename: str):
-    """Download output file"""
+async def download_file(filename: str, request: Request):
+    """Download output file (supports a single Range so downloads can resume)"""
     try:
         # Check in output directory
         file_path = Path('output') / filename
@@ -727,15 +1392,95 @@ async def download_file(filename: str):
         if not file_path.exists():
             raise HTTPException(status_code=404, detail="File not found")
         
-        return FileResponse(
+        media_type = DOWNLOAD_MEDIA_TYPES.get(file_path.suffix, 'application/octet-stream')
+        
+        if DOWNLOAD_ACCEL_PREFIX:
+            return Response(
+                media_type=media_type,
+                headers={
+                    'X-Accel-Redirect': f"{DOWNLOAD_ACCEL_PREFIX}/{file_path.as_posix()}",
+                    'Content-Disposition': f'attachment; filename="{filename}"'
+                }
+            )
+        
+        stat_result = os.stat(file_path)
+        
+        range_match = RANGE_RE.match(request.headers.get('range', ''))
+        if range_match:
+            size = stat_result.st_size
+            first, last = range_match.groups()
+            if first:
+                start = int(first)
+                end = min(int(last), size - 1) if last else size - 1
+            elif last:
+                start = max(size - int(last), 0)
+                end = size - 1
+            else:
+                start, end = 0, -1
+            
+            if start > end:
+                return Response(status_code=416, headers={'Content-Range': f"bytes */{size}"})
+            
+            return StreamingResponse(
+                iter_file_range(file_path, start, end - start + 1),
+                status_code=206,
+                media_type=media_type,
+                headers={
+                    'Content-Range': f"bytes {start}-{end}/{size}",
+                    'Content-Length': str(end - start + 1),
+                    'Accept-Ranges': 'bytes',
+                    'Content-Disposition': f'attachment; filename="{filename}"'
+                }
+            )
+        
+        # Pass the stat result along so FileResponse doesn't stat the file again
+        return LargeChunkFileResponse(
             path=file_path,
             filename=filename,
-            media_type='application/octet-stream'
+            media_type=media_type,
+            stat_result=stat_result,
+            headers={'Accept-Ranges': 'bytes'}
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error downloading file: {str(e)}")
 
+def find_csv_transcript(csv_path: Path, video_id: str) -> Optional[str]:
+    """
+    Find a video's transcript in an output CSV.
+
+    Args:
+        csv_path: Path to an output CSV file
+        video_id: ID of the video
+
+    Returns:
+        The transcript, or None if the video isn't in the file
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='', buffering=FILE_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if 'video_id' not in header or 'transcript' not in header:
+            return None
+        id_col = header.index('video_id')
+        transcript_col = header.index('transcript')
+        for row in reader:
+            if len(row) > transcript_col and row[id_col] == video_id:
+                return row[transcript_col]
+    return None
+
+@app.get("/api/transcript/{filename}/{video_id}")
+async def get_transcript(filename: str, video_id: str):
+    """Get one video's transcript from an output CSV"""
+    file_path = Path('output') / filename
+    if not filename.endswith('.csv') or not file_path.is_file():
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    transcript = await run_in_threadpool(find_csv_transcript, file_path, video_id)
+    if transcript is None:
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    return {"videoId": video_id, "transcript": transcript}
+
 @app.get("/api/preview/{filename}")
 async def preview_file(filename: str):
     """Get preview of output file"""
@@ -751,14 +1496,9 @@ async def preview_file(filename: str):
         
         # For CSV files
         if filename.endswith('.csv'):
-            import csv
-            rows = []
             with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for i, row in enumerate(reader):
-                    if i >= 10:  # Limit to 10 rows for preview
-                        break
-                    rows.append(row)
+                # Limit to 10 rows for preview
+                rows = list(islice(csv.DictReader(f), 10))
             
             return {
                 "type": "csv",
@@ -770,12 +1510,11 @@ async def preview_file(filename: str):
         # For JSONL files
         elif filename.endswith('.jsonl'):
             samples = []
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for i, line in enumerate(f):
-                    if i >= 5:  # Limit to 5 samples for preview
-                        break
+            with open(file_path, 'rb') as f:
+                # Limit to the first 5 lines for preview
+                for line in islice(f, 5):
                     try:
-                        samples.append(json.loads(line))
+                        samples.append(json_compat.loads(line))
                     except json.JSONDecodeError:
                         continue
             
@@ -793,36 +1532,12 @@ async def preview_file(filename: str):
         logger.error(f"Error previewing file: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error previewing file: {str(e)}")
 
-@app.get("/api/view/{filename}")
-async def view_file(filename: str, format: str = "table"):
-    """View full file contents"""
-    try:
-        # Check in output directory
-        file_path = Path('output') / filename
-        if not file_path.exists():
-            # Check in training_data directory
-            file_path = Path('training_data') / filename
-        
-        if not file_path.exists():
-            raise HTTPException(status_code=404, detail="File not found")
-        
-        # For CSV files - return as HTML table
-        if filename.endswith('.csv') and format == "table":
-            import csv
-            rows = []
-            headers = []
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                headers = reader.fieldnames
-                for row in reader:
-                    rows.append(row)
-            
-            # Generate HTML table
-            html = f"""
+# Page shells for /api/view (str.format templates)
+TABLE_PAGE_HEAD = """
             <!DOCTYPE html>
             <html>
             <head>
-                <title>{filename}</title>
+                <title>{title}</title>
                 <style>
                     body {{ font-family: Arial, sans-serif; padding: 20px; background: #f5f5f5; }}
                     h1 {{ color: #333; }}
@@ -834,42 +1549,31 @@ async def view_file(filename: str, format: str = "table"):
                 </style>
             </head>
             <body>
-                <h1>{filename}</h1>
-                <p>Total rows: {len(rows)}</p>
+                <h1>{title}</h1>
                 <div class="container">
                     <table>
                         <thead>
                             <tr>
-                                {''.join(f'<th>{h}</th>' for h in headers)}
+                                {headers}
                             </tr>
                         </thead>
                         <tbody>
-                            {''.join('<tr>' + ''.join(f'<td>{row.get(h, "")}</td>' for h in headers) + '</tr>' for row in rows)}
+                            """
+
+TABLE_PAGE_FOOT = """
                         </tbody>
                     </table>
                 </div>
+                <p>Total rows: {total_rows}</p>
             </body>
             </html>
             """
-            
-            return HTMLResponse(content=html)
-        
-        # For JSONL files - return formatted samples
-        elif filename.endswith('.jsonl') and format == "samples":
-            samples = []
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    try:
-                        samples.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
-            
-            # Generate HTML for JSONL
-            html = f"""
+
+SAMPLES_PAGE_HEAD = """
             <!DOCTYPE html>
             <html>
             <head>
-                <title>{filename}</title>
+                <title>{title}</title>
                 <style>
                     body {{ font-family: 'Monaco', 'Courier New', monospace; padding: 20px; background: #1e1e1e; color: #d4d4d4; }}
                     h1 {{ color: #4CAF50; }}
@@ -879,14 +1583,76 @@ async def view_file(filename: str, format: str = "table"):
                 </style>
             </head>
             <body>
-                <h1>{filename}</h1>
-                <p>Total samples: {len(samples)}</p>
-                {''.join(f'<div class="sample"><div class="sample-header">Sample {i+1}</div><pre>{json.dumps(sample, indent=2, ensure_ascii=False)}</pre></div>' for i, sample in enumerate(samples))}
+                <h1>{title}</h1>
+                """
+
+SAMPLES_PAGE_FOOT = """
+                <p>Total samples: {total_samples}</p>
             </body>
             </html>
             """
+
+# One JSONL sample in the samples view: (sample number, escaped JSON)
+SAMPLE_HTML = '<div class="sample"><div class="sample-header">Sample %d</div><pre>%s</pre></div>'
+
+@app.get("/api/view/{filename}")
+async def view_file(filename: str, format: str = "table"):
+    """View full file contents"""
+    try:
+        # Check in output directory
+        file_path = Path('output') / filename
+        if not file_path.exists():
+            # Check in training_data directory
+            file_path = Path('training_data') / filename
+        
+        if not file_path.exists():
+            raise HTTPException(status_code=404, detail="File not found")
+        
+        # For CSV files - return as HTML table
+        if filename.endswith('.csv') and format == "table":
+            def render_table():
+                # Stream one row at a time instead of building the whole page in memory
+                with open(file_path, 'r', encoding='utf-8', newline='', buffering=FILE_BUFFER_SIZE) as f:
+                    reader = csv.reader(f)
+                    headers = next(reader, [])
+                    # Short rows are padded to the header width, extra fields dropped
+                    width = len(headers)
+                    padding = [''] * width
+                    yield TABLE_PAGE_HEAD.format(title=escape(filename), headers=''.join(f'<th>{escape(h)}</th>' for h in headers))
+                    
+                    total_rows = 0
+                    for row in reader:
+                        if not row:
+                            continue
+                        total_rows += 1
+                        if len(row) < width:
+                            row += padding[len(row):]
+                        yield '<tr><td>' + '</td><td>'.join(map(escape, row[:width])) + '</td></tr>'
+                    
+                    yield TABLE_PAGE_FOOT.format(total_rows=total_rows)
+            
+            return StreamingResponse(batch_chunks(render_table()), media_type="text/html")
+        
+        # For JSONL files - return formatted samples
+        elif filename.endswith('.jsonl') and format == "samples":
+            def render_samples():
+                # Stream one sample at a time instead of loading the whole file
+                yield SAMPLES_PAGE_HEAD.format(title=escape(filename))
+                
+                total_samples = 0
+                # Lines are handed to the parser as bytes, so they are never decoded to str first
+                with open(file_path, 'rb', buffering=FILE_BUFFER_SIZE) as f:
+                    for line in f:
+                        try:
+                            sample = json_compat.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        total_samples += 1
+                        yield SAMPLE_HTML % (total_samples, escape(json_compat.dumps(sample, indent=True).decode()))
+                
+                yield SAMPLES_PAGE_FOOT.format(total_samples=total_samples)
             
-            return HTMLResponse(content=html)
+            return StreamingResponse(batch_chunks(render_samples()), media_type="text/html")
         
         else:
             raise HTTPException(status_code=400, detail="Unsupported file type or format")
@@ -899,16 +1665,14 @@ async def view_file(filename: str, format: str = "table"):
 async def list_output_files():
     """List all files in output directory"""
     try:
-        output_dir = Path('output')
-        if not output_dir.exists():
-            return {"files": []}
-        
         files = []
-        for file_path in sorted(output_dir.glob('*.csv'), key=lambda x: x.stat().st_mtime, reverse=True):
+        # scandir entries cache their stat, so each file is stat'ed once
+        for entry in scan_dir_by_mtime(Path('output'), '.csv'):
+            stat_result = entry.stat()
             files.append({
-                "name": file_path.name,
-                "size": file_path.stat().st_size,
-                "modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat(),
+                "name": entry.name,
+                "size": stat_result.st_size,
+                "modified": datetime.fromtimestamp(stat_result.st_mtime).isoformat(),
                 "type": "csv"
             })
         
@@ -921,16 +1685,14 @@ async def list_output_files():
 async def list_training_files():
     """List all files in training_data directory"""
     try:
-        training_dir = Path('training_data')
-        if not training_dir.exists():
-            return {"files": []}
-        
         files = []
-        for file_path in sorted(training_dir.glob('*.jsonl'), key=lambda x: x.stat().st_mtime, reverse=True):
+        # scandir entries cache their stat, so each file is stat'ed once
+        for entry in scan_dir_by_mtime(Path('training_data'), '.jsonl'):
+            stat_result = entry.stat()
             files.append({
-                "name": file_path.name,
-                "size": file_path.stat().st_size,
-                "modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat(),
+                "name": entry.name,
+                "size": stat_result.st_size,
+                "modified": datetime.fromtimestamp(stat_result.st_mtime).isoformat(),
                 "type": "jsonl"
             })
         
@@ -939,87 +1701,103 @@ async def list_training_files():
         logger.error(f"Error listing training files: {e}")
         return {"files": []}
 
+def describe_input_file(file_path: Path, stat_result: os.stat_result) -> Dict[str, Any]:
+    """Summarize an input JSON export for the channel view."""
+    # Same layouts as uploads; streamed with ijson rather than fully parsed
+    video_count, _ = scan_upload_video_ids(str(file_path))
+    return {
+        "name": file_path.name,
+        "path": str(file_path),
+        "size": stat_result.st_size,
+        "modified": datetime.fromtimestamp(stat_result.st_mtime).isoformat(),
+        "type": "json",
+        "videoCount": video_count
+    }
+
+def describe_output_file(file_path: Path, stat_result: os.stat_result) -> Dict[str, Any]:
+    """Summarize an output CSV for the channel view."""
+    video_count, total_views, total_likes = summarize_csv(file_path)
+    return {
+        "name": file_path.name,
+        "path": str(file_path),
+        "size": stat_result.st_size,
+        "modified": datetime.fromtimestamp(stat_result.st_mtime).isoformat(),
+        "type": "csv",
+        "videoCount": video_count,
+        "totalViews": total_views,
+        "totalLikes": total_likes
+    }
+
+def describe_training_file(file_path: Path, stat_result: os.stat_result) -> Dict[str, Any]:
+    """Summarize a training JSONL for the channel view."""
+    return {
+        "name": file_path.name,
+        "path": str(file_path),
+        "size": stat_result.st_size,
+        "modified": datetime.fromtimestamp(stat_result.st_mtime).isoformat(),
+        "type": "jsonl",
+        # One example per non-blank line, counted without decoding
+        "exampleCount": count_nonblank_lines(file_path)
+    }
+
+# Per-file channel summaries by (path, mtime, size). Output files aren't
+# rewritten, so a repeat /api/channel request only needs to stat them.
+FILE_SUMMARY_CACHE_SIZE = 1024
+file_summary_cache = OrderedDict()
+
+async def describe_channel_files(directory: Path, suffix: str, prefix: str, describe, kind: str):
+    """
+    Summarize a channel's files in one directory, newest first.
+
+    Files are read concurrently in the threadpool; a file that can't be read
+    is logged and left out. Summaries of unchanged files are reused.
+
+    Args:
+        directory: Directory to scan
+        suffix: Filename suffix (e.g. '.csv')
+        prefix: Filename prefix for the channel
+        describe: Function (path, stat_result) -> summary dict
+        kind: File kind for error messages ('input', 'output', 'training')
+
+    Returns:
+        List of summary dicts
+    """
+    entries = await run_in_threadpool(scan_dir_by_mtime, directory, suffix, prefix)
+    
+    async def describe_one(entry):
+        file_path = directory / entry.name
+        stat_result = entry.stat()
+        cache_key = (str(file_path), stat_result.st_mtime_ns, stat_result.st_size)
+        summary = file_summary_cache.get(cache_key)
+        if summary is not None:
+            file_summary_cache.move_to_end(cache_key)
+            return summary
+        
+        try:
+            summary = await run_in_threadpool(describe, file_path, stat_result)
+        except Exception as e:
+            logger.error(f"Error reading {kind} file {file_path}: {e}")
+            return None
+        
+        file_summary_cache[cache_key] = summary
+        if len(file_summary_cache) > FILE_SUMMARY_CACHE_SIZE:
+            file_summary_cache.popitem(last=False)
+        return summary
+    
+    results = await asyncio.gather(*[describe_one(entry) for entry in entries])
+    return [result for result in results if result is not None]
+
 @app.get("/api/channel/{channel_name}")
 async def get_channel_data(channel_name: str):
     """Get all data for a specific channel from input, output, and training_data directories"""
     try:
         channel_name_lower = channel_name.lower()
         
-        # Input files
-        input_dir = Path('input')
-        input_files = []
-        if input_dir.exists():
-            for file_path in input_dir.glob(f'{channel_name_lower}*.json'):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        videos = []
-                        if isinstance(data, dict):
-                            videos = data.get('videos', data.get('itemList', []))
-                        elif isinstance(data, list):
-                            videos = data
-                        
-                        input_files.append({
-                            "name": file_path.name,
-                            "path": str(file_path),
-                            "size": file_path.stat().st_size,
-                            "modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat(),
-                            "type": "json",
-                            "videoCount": len(videos)
-                        })
-                except Exception as e:
-                    logger.error(f"Error reading input file {file_path}: {e}")
-        
-        # Output files
-        output_dir = Path('output')
-        output_files = []
-        if output_dir.exists():
-            for file_path in sorted(output_dir.glob(f'{channel_name_lower}_*.csv'), key=lambda x: x.stat().st_mtime, reverse=True):
-                try:
-                    import csv
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        reader = csv.DictReader(f)
-                        rows = list(reader)
-                        
-                        total_views = sum(int(row.get('view_count', 0) or 0) for row in rows if row.get('view_count', '').isdigit())
-                        total_likes = sum(int(row.get('like_count', 0) or 0) for row in rows if row.get('like_count', '').isdigit())
-                        
-                        output_files.append({
-                            "name": file_path.name,
-                            "path": str(file_path),
-                            "size": file_path.stat().st_size,
-                            "modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat(),
-                            "type": "csv",
-                            "videoCount": len(rows),
-                            "totalViews": total_views,
-                            "totalLikes": total_likes
-                        })
-                except Exception as e:
-                    logger.error(f"Error reading output file {file_path}: {e}")
-        
-        # Training data files
-        training_dir = Path('training_data')
-        training_files = []
-        if training_dir.exists():
-            for file_path in sorted(training_dir.glob(f'{channel_name_lower}_*.jsonl'), key=lambda x: x.stat().st_mtime, reverse=True):
-                try:
-                    # Count examples in JSONL
-                    example_count = 0
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            if line.strip():
-                                example_count += 1
-                    
-                    training_files.append({
-                        "name": file_path.name,
-                        "path": str(file_path),
-                        "size": file_path.stat().st_size,
-                        "modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat(),
-                        "type": "jsonl",
-                        "exampleCount": example_count
-                    })
-                except Exception as e:
-                    logger.error(f"Error reading training file {file_path}: {e}")
+        input_files, output_files, training_files = await asyncio.gather(
+            describe_channel_files(Path('input'), '.json', channel_name_lower, describe_input_file, 'input'),
+            describe_channel_files(Path('output'), '.csv', f"{channel_name_lower}_", describe_output_file, 'output'),
+            describe_channel_files(Path('training_data'), '.jsonl', f"{channel_name_lower}_", describe_training_file, 'training')
+        )
         
         if not input_files and not output_files and not training_files:
             raise HTTPException(status_code=404, detail=f"No data found for channel '{channel_name}'")
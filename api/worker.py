@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+arq worker for video processing jobs
+
+Runs the OpusClip pipeline outside the API process so restarts of the
+API don't drop in-flight jobs. Requires REDIS_URL (shared with the API
+server for both the queue and job state).
+
+Usage:
+    arq api.worker.WorkerSettings
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from arq.connections import RedisSettings
+
+sys.path.append(str(Path(__file__).parent))
+
+from server import process_videos as run_process_videos
+
+
+async def process_videos(ctx, job_id: str):
+    """Process a job created by /api/process."""
+    await run_process_videos(job_id)
+
+
+class WorkerSettings:
+    functions = [process_videos]
+    redis_settings = RedisSettings.from_dsn(os.getenv('REDIS_URL', 'redis://localhost:6379'))
+    # Jobs wait up to 10 minutes per video on OpusClip
+    job_timeout = 6 * 60 * 60
+    max_jobs = 10
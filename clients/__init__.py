@@ -4,8 +4,8 @@ BrandVoice Clients
 External API clients for third-party services.
 """
 
-from .opus_client import OpusClipClient, get_verbal_transcript
+from .opus_client import OpusClipClient, AsyncOpusClipClient, get_verbal_transcript
 
-__all__ = ['OpusClipClient', 'get_verbal_transcript']
+__all__ = ['OpusClipClient', 'AsyncOpusClipClient', 'get_verbal_transcript']
 
 
@@ -3,15 +3,77 @@
 OpusClip API Client for transcript extraction
 """
 
+import asyncio
+import random
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import os
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
+from utils import json_compat
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# HTTP/2 lets concurrent status polls share one connection; httpx needs the
+# h2 package for it (pip install httpx[http2])
+try:
+    import h2
+except ImportError:
+    h2 = None
+
 # Load environment variables
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
+# Project status polling backs off exponentially: short videos are picked up
+# within seconds, long ones are checked at most every MAX_POLL_INTERVAL.
+# Each wait gets up to POLL_JITTER extra so concurrent projects don't poll in
+# lockstep, and the wait drops back to POLL_INTERVAL whenever the stage changes.
+POLL_INTERVAL = 1.0
+MAX_POLL_INTERVAL = 30.0
+POLL_JITTER = 0.2
+
+
+# Rate-limited (429) and transient server errors are retried with exponential
+# backoff. POSTs are only retried on 429 so a project is never submitted twice
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_REQUEST_RETRIES = 3
+RETRY_BACKOFF = 0.3
+
+# Per-client caps on in-flight requests and request rate for
+# AsyncOpusClipClient, so large batches stay under OpusClip's rate limits
+MAX_CONCURRENT_REQUESTS = int(os.getenv('OPUS_MAX_CONCURRENCY', '16'))
+MAX_REQUESTS_PER_SECOND = float(os.getenv('OPUS_MAX_RPS', '10'))
+
+
+def poll_delay(poll_interval: float) -> float:
+    """Return poll_interval plus up to POLL_JITTER of random extra wait."""
+    return poll_interval + random.uniform(0, poll_interval * POLL_JITTER)
+
+
+def retry_delay(retry_after: Optional[str], attempt: int) -> float:
+    """
+    Seconds to wait before retrying a failed request.
+
+    Args:
+        retry_after: Retry-After header value, if the server sent one
+        attempt: Number of attempts made so far (0 for the first retry)
+
+    Returns:
+        The server's Retry-After in seconds if numeric, otherwise
+        RETRY_BACKOFF doubled per attempt; capped at MAX_POLL_INTERVAL
+    """
+    try:
+        delay = float(retry_after)
+    except (TypeError, ValueError):
+        delay = RETRY_BACKOFF * (2 ** attempt)
+    return min(max(delay, 0.0), MAX_POLL_INTERVAL)
+
 
 def get_verbal_transcript(chapters: List[Dict]) -> str:
     """
@@ -29,16 +91,13 @@ def get_verbal_transcript(chapters: List[Dict]) -> str:
     if not chapters:
         return ""
     
-    verbal_parts = []
-    for chapter in chapters:
-        lines = chapter.get('lines', [])
-        for line in lines:
-            if line.get('type') == 'verbal':
-                content = line.get('content', '').strip()
-                if content:
-                    verbal_parts.append(content)
-    
-    return ''.join(verbal_parts)
+    verbal_lines = (
+        line.get('content', '').strip()
+        for chapter in chapters
+        for line in chapter.get('lines') or ()
+        if line.get('type') == 'verbal'
+    )
+    return ''.join(content for content in verbal_lines if content)
 
 
 def get_enhanced_transcript(chapters: List[Dict]) -> str:
@@ -61,28 +120,53 @@ def get_enhanced_transcript(chapters: List[Dict]) -> str:
     if not chapters:
         return ""
     
-    parts = []
+    return ' '.join(_enhanced_transcript_parts(chapters))
+
+
+def _enhanced_transcript_parts(chapters: List[Dict]):
+    """Yield the pieces of get_enhanced_transcript() in order."""
     for chapter in chapters:
         # Add chapter summary if present
         summary = chapter.get('summary', '').strip()
         if summary:
-            parts.append(f"[Visual: {summary}]")
+            yield f"[Visual: {summary}]"
         
         # Process lines in order
-        lines = chapter.get('lines', [])
-        for line in lines:
-            line_type = line.get('type')
+        for line in chapter.get('lines') or ():
             content = line.get('content', '').strip()
-            
             if not content:
                 continue
             
+            line_type = line.get('type')
             if line_type == 'verbal':
-                parts.append(content)
+                yield content
             elif line_type == 'visual':
-                parts.append(f"[Visual: {content}]")
-    
-    return ' '.join(parts)
+                yield f"[Visual: {content}]"
+
+
+def normalize_project_response(result: Dict) -> Dict:
+    """
+    Add 'projectId' to a clip-projects response.
+
+    Response format: {"id": "P2110204gITq"}; 'projectId' is kept for
+    backward compatibility.
+    """
+    if 'id' in result and 'projectId' not in result:
+        result['projectId'] = result['id']
+    return result
+
+
+def exportable_clips_from_response(data) -> List[Dict]:
+    """
+    Get the clip list from an exportable-clips response.
+
+    Response structure: {'data': [...clips...], 'total': N}, or a bare list.
+    """
+    if isinstance(data, dict) and 'data' in data:
+        return data.get('data', [])
+    if isinstance(data, list):
+        return data
+    return []
 
 class OpusClipClient:
     def __init__(self, api_key: Optional[str] = None):
@@ -96,6 +180,23 @@ class OpusClipClient:
             "Content-Type": "application/json"
         }
 
+        # One session so repeated calls (status polls, clip fetches) reuse
+        # kept-alive connections. Transient errors on GETs are retried;
+        # POSTs aren't, so a project is never submitted twice.
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        retry = Retry(total=MAX_REQUEST_RETRIES, backoff_factor=RETRY_BACKOFF, status_forcelist=RETRY_STATUSES)
+        self._session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry))
+
+    def close(self):
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def submit_project(self, video_url: str) -> Dict:
         """
         Submit a video URL to OpusClip for processing with skipCurate option.
@@ -115,16 +216,9 @@ class OpusClipClient:
         }
 
         try:
-            response = requests.post(endpoint, json=payload, headers=self.headers, timeout=30)
+            response = self._session.post(endpoint, json=payload, timeout=30)
             response.raise_for_status()
-            result = response.json()
-
-            # Response format: {"id": "P2110204gITq"}
-            # Normalize to include 'projectId' for backward compatibility
-            if 'id' in result and 'projectId' not in result:
-                result['projectId'] = result['id']
-
-            return result
+            return normalize_project_response(json_compat.loads(response.content))
         except requests.exceptions.RequestException as e:
             print(f"❌ Failed to submit project for {video_url}: {e}")
             raise
@@ -142,9 +236,9 @@ class OpusClipClient:
         endpoint = f"{self.base_url}/clip-projects/{project_id}"
 
         try:
-            response = requests.get(endpoint, headers=self.headers, timeout=30)
+            response = self._session.get(endpoint, timeout=30)
             response.raise_for_status()
-            return response.json()
+            return json_compat.loads(response.content)
         except requests.exceptions.RequestException as e:
             print(f"❌ Failed to get project status for {project_id}: {e}")
             raise
@@ -162,9 +256,9 @@ class OpusClipClient:
         endpoint = f"{self.base_url}/clips/{project_id}"
 
         try:
-            response = requests.get(endpoint, headers=self.headers, timeout=30)
+            response = self._session.get(endpoint, timeout=30)
             response.raise_for_status()
-            data = response.json()
+            data = json_compat.loads(response.content)
             return data.get('clips', [])
         except requests.exceptions.RequestException as e:
             print(f"❌ Failed to get clips for {project_id}: {e}")
@@ -184,19 +278,9 @@ class OpusClipClient:
         params = {"projectId": project_id}
 
         try:
-            response = requests.get(endpoint, params=params, headers=self.headers, timeout=30)
+            response = self._session.get(endpoint, params=params, timeout=30)
             response.raise_for_status()
-            data = response.json()
-            
-            # Response structure: {'data': [...clips...], 'total': N}
-            if isinstance(data, dict) and 'data' in data:
-                return data.get('data', [])
-            
-            # Fallback: if response is already a list
-            if isinstance(data, list):
-                return data
-            
-            return []
+            return exportable_clips_from_response(json_compat.loads(response.content))
         except requests.exceptions.RequestException as e:
             print(f"❌ Failed to get exportable clips for {project_id}: {e}")
             raise
@@ -215,36 +299,46 @@ class OpusClipClient:
         endpoint = f"{self.base_url}/exportable-clips/{project_id}.{clip_id}"
 
         try:
-            response = requests.get(endpoint, headers=self.headers, timeout=30)
+            response = self._session.get(endpoint, timeout=30)
             response.raise_for_status()
-            return response.json()
+            return json_compat.loads(response.content)
         except requests.exceptions.RequestException as e:
             print(f"❌ Failed to get exportable clip {project_id}.{clip_id}: {e}")
             raise
 
-    def wait_for_project_completion(self, project_id: str, max_wait_seconds: int = 600, poll_interval: int = 10) -> bool:
+    def wait_for_project_completion(self, project_id: str, max_wait_seconds: int = 600,
+                                    poll_interval: float = POLL_INTERVAL, max_poll_interval: float = MAX_POLL_INTERVAL) -> bool:
         """
         Poll project status until completion or timeout.
 
+        The wait between checks starts at poll_interval and doubles after
+        each check, up to max_poll_interval. It resets to poll_interval when
+        the project moves to a new stage.
+
         Args:
             project_id: OpusClip project ID
             max_wait_seconds: Maximum time to wait (default 10 minutes)
-            poll_interval: Seconds between status checks
+            poll_interval: Seconds before the second status check
+            max_poll_interval: Longest wait between status checks
 
         Returns:
             True if completed successfully, False if timeout or error
         """
         start_time = time.time()
+        initial_interval = poll_interval
+        last_stage = None
 
         while time.time() - start_time < max_wait_seconds:
             try:
                 status = self.get_project_status(project_id)
                 stage = status.get('stage', 'unknown')
+                if stage != last_stage:
+                    poll_interval = initial_interval
+                    last_stage = stage
                 
                 # Print poll status - only show stage
                 elapsed = int(time.time() - start_time)
-                print(f"\n🔄 Pull status for {project_id} (elapsed: {elapsed}s):")
-                print(f"   Stage: {stage}")
+                print(f"\n🔄 Pull status for {project_id} (elapsed: {elapsed}s):\n   Stage: {stage}")
 
                 if stage == 'COMPLETE':
                     print(f"✅ Project {project_id} completed")
@@ -257,15 +351,15 @@ class OpusClipClient:
                     return False
 
                 # Still processing
-                time.sleep(poll_interval)
+                time.sleep(poll_delay(poll_interval))
+                poll_interval = min(poll_interval * 2, max_poll_interval)
 
             except Exception as e:
                 print(f"\n⚠️  Error checking status for {project_id}:")
                 print(f"   Error type: {type(e).__name__}")
                 print(f"   Error message: {str(e)}")
-                import traceback
-                print(f"   Traceback: {traceback.format_exc()}")
-                time.sleep(poll_interval)
+                time.sleep(poll_delay(poll_interval))
+                poll_interval = min(poll_interval * 2, max_poll_interval)
 
         print(f"\n⏱️  Timeout waiting for project {project_id}")
         print(f"   Max wait time reached: {max_wait_seconds}s")
@@ -383,25 +477,16 @@ class OpusClipClient:
             if not self.wait_for_project_completion(project_id, max_wait_seconds):
                 return None
 
-            # Step 3: Get clips
-            clips = self.get_clips(project_id)
-            if not clips:
+            # Step 3: Get exportable clips (screenplay included)
+            exportable_clips = self.get_exportable_clips(project_id)
+            if not exportable_clips:
                 print(f"❌ No clips found for project {project_id}")
                 return None
 
             # Use first clip for transcript
-            first_clip = clips[0]
-            clip_id = first_clip.get('clipId')
-
-            if not clip_id:
-                print(f"❌ No clipId found in first clip")
-                return None
-
-            # Step 4: Get exportable clip with screenplay
-            exportable_clip = self.get_exportable_clip(project_id, clip_id)
-            screenplay = exportable_clip.get('screenplay', [])
+            screenplay = exportable_clips[0].get('screenplay', {})
 
-            # Step 5: Extract transcript
+            # Step 4: Extract transcript
             transcript = self.extract_transcript_from_screenplay(screenplay)
             print(f"✅ Extracted transcript ({len(transcript)} chars)")
             return transcript
@@ -411,6 +496,200 @@ class OpusClipClient:
             return None
 
 
+class AsyncOpusClipClient:
+    """
+    Async OpusClip client for the API server and CLI pipeline.
+
+    All requests share one httpx.AsyncClient connection pool, so concurrent
+    submissions and status polls reuse connections instead of opening a new
+    TLS connection each, and waiting on a project doesn't hold a thread.
+    With h2 installed the pool speaks HTTP/2 and multiplexes the polls.
+    At most max_concurrency requests are in flight at once and they are
+    spaced to max_rps, however many projects are being waited on.
+    Use as an async context manager (or call aclose()) to release the pool.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, max_connections: int = 32,
+                 max_concurrency: int = MAX_CONCURRENT_REQUESTS, max_rps: float = MAX_REQUESTS_PER_SECOND):
+        if httpx is None:
+            raise ImportError("httpx is required for AsyncOpusClipClient. Install with: pip install httpx")
+
+        self.api_key = api_key or os.getenv('OPUSCLIP_API_KEY')
+        if not self.api_key:
+            raise ValueError("OpusClip API key is required. Set OPUSCLIP_API_KEY in .env")
+
+        self.base_url = "https://api.opus.pro/api"
+        self._client = httpx.AsyncClient(
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            timeout=30,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            http2=h2 is not None
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._min_interval = 1.0 / max_rps if max_rps > 0 else 0.0
+        self._next_request_at = 0.0
+
+    async def _throttle(self):
+        # Reserve the next send slot; no await between read and update, so
+        # concurrent tasks each get their own slot
+        now = time.monotonic()
+        wait = self._next_request_at - now
+        self._next_request_at = max(now, self._next_request_at) + self._min_interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _request(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        """
+        Send a request within the concurrency and rate limits, retrying
+        RETRY_STATUSES responses like OpusClipClient's session does.
+        """
+        for attempt in range(MAX_REQUEST_RETRIES + 1):
+            async with self._semaphore:
+                await self._throttle()
+                response = await self._client.request(method, url, **kwargs)
+
+            status = response.status_code
+            retryable = status == 429 or (method == 'GET' and status in RETRY_STATUSES)
+            if not retryable or attempt == MAX_REQUEST_RETRIES:
+                return response
+            await asyncio.sleep(retry_delay(response.headers.get('Retry-After'), attempt))
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def submit_project(self, video_url: str) -> Dict:
+        """
+        Submit a video URL to OpusClip for processing.
+
+        Args:
+            video_url: TikTok video URL
+
+        Returns:
+            Project response with 'id' and 'projectId' fields
+        """
+        payload = {
+            "videoUrl": video_url,
+            "curationPref": {
+                "model": "ClipAnything"
+            }
+        }
+
+        try:
+            response = await self._request('POST', f"{self.base_url}/clip-projects", json=payload)
+            response.raise_for_status()
+            return normalize_project_response(json_compat.loads(response.content))
+        except httpx.HTTPError as e:
+            print(f"❌ Failed to submit project for {video_url}: {e}")
+            raise
+
+    async def get_project_status(self, project_id: str) -> Dict:
+        """
+        Get the status of a submitted project.
+
+        Args:
+            project_id: OpusClip project ID
+
+        Returns:
+            Project status information
+        """
+        try:
+            response = await self._request('GET', f"{self.base_url}/clip-projects/{project_id}")
+            response.raise_for_status()
+            return json_compat.loads(response.content)
+        except httpx.HTTPError as e:
+            print(f"❌ Failed to get project status for {project_id}: {e}")
+            raise
+
+    async def get_exportable_clips(self, project_id: str) -> List[Dict]:
+        """
+        Get all exportable clips for a project.
+
+        Args:
+            project_id: OpusClip project ID
+
+        Returns:
+            List of exportable clips with screenplay data
+        """
+        try:
+            response = await self._request(
+                'GET', f"{self.base_url}/exportable-clips", params={"projectId": project_id}
+            )
+            response.raise_for_status()
+            return exportable_clips_from_response(json_compat.loads(response.content))
+        except httpx.HTTPError as e:
+            print(f"❌ Failed to get exportable clips for {project_id}: {e}")
+            raise
+
+    async def wait_for_project_completion(self, project_id: str, max_wait_seconds: int = 600,
+                                          poll_interval: float = POLL_INTERVAL, max_poll_interval: float = MAX_POLL_INTERVAL) -> bool:
+        """
+        Poll project status until completion or timeout, backing off like
+        OpusClipClient.wait_for_project_completion.
+
+        Args:
+            project_id: OpusClip project ID
+            max_wait_seconds: Maximum time to wait (default 10 minutes)
+            poll_interval: Seconds before the second status check
+            max_poll_interval: Longest wait between status checks
+
+        Returns:
+            True if completed successfully, False if timeout or error
+        """
+        start_time = time.time()
+        initial_interval = poll_interval
+        last_stage = None
+
+        while time.time() - start_time < max_wait_seconds:
+            try:
+                status = await self.get_project_status(project_id)
+                stage = status.get('stage', 'unknown')
+                if stage != last_stage:
+                    poll_interval = initial_interval
+                    last_stage = stage
+
+                elapsed = int(time.time() - start_time)
+                print(f"\n🔄 Pull status for {project_id} (elapsed: {elapsed}s):\n   Stage: {stage}")
+
+                if stage == 'COMPLETE':
+                    print(f"✅ Project {project_id} completed")
+                    return True
+                elif stage in ['FAILED', 'ERROR', 'STALLED']:
+                    print(f"❌ Project {project_id} failed with stage: {stage}")
+                    if stage == 'STALLED':
+                        print("   ⏭️  Skipping stalled project - continuing with other projects")
+                    print(f"   Error response: {status}")
+                    return False
+
+            except Exception as e:
+                print(f"\n⚠️  Error checking status for {project_id}: {type(e).__name__}: {e}")
+
+            await asyncio.sleep(poll_delay(poll_interval))
+            poll_interval = min(poll_interval * 2, max_poll_interval)
+
+        print(f"\n⏱️  Timeout waiting for project {project_id}")
+        print(f"   Max wait time reached: {max_wait_seconds}s")
+        return False
+
+    def extract_enhanced_transcript_from_screenplay(self, screenplay: Dict) -> str:
+        """
+        Extract enhanced transcript with visual context from screenplay JSON.
+
+        See OpusClipClient.extract_enhanced_transcript_from_screenplay.
+        """
+        if not screenplay:
+            return ""
+        return get_enhanced_transcript(screenplay.get('chapters', []))
+
+
 if __name__ == "__main__":
     # Test the client
     client = OpusClipClient()
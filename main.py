@@ -21,20 +21,49 @@ Usage:
 
 import argparse
 import asyncio
+import json
 import os
+import re
 import sys
 import csv
+import traceback
+from itertools import islice
 from typing import Optional, List, Dict, Tuple
 from dotenv import load_dotenv
 
 from utils.json_processor import TikTokJSONProcessor
 from utils.csv_generator import CSVGenerator
 from utils.jsonl_converter import JSONLConverter
-from clients.opus_client import OpusClipClient
+from clients.opus_client import AsyncOpusClipClient
 
 # Load environment variables
 load_dotenv()
 
+# Prompt for analyze_content_with_llm; one LLM_ANALYSIS_SAMPLE per sampled row
+LLM_ANALYSIS_SAMPLE = """Video {number}:
+  Description: {description}
+  Hashtags: {hashtags}
+  Transcript excerpt: {transcript}..."""
+
+LLM_ANALYSIS_PROMPT = """Analyze the following TikTok video data samples and suggest optimal parameters for JSONL training data conversion:
+
+Sample Data:
+{samples}
+
+Based on this content, please suggest:
+1. The primary language used (e.g., English, Spanish, French, etc.)
+2. An optimal maximum character limit for TikTok descriptions (typically 100-300 characters, considering TikTok's platform and the style of these videos)
+
+Respond in JSON format:
+{{
+  "language": "detected language",
+  "max_char": recommended_number,
+  "reasoning": "brief explanation"
+}}"""
+
+# Fenced ```json block, for replies that wrap the JSON in markdown
+JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
 
 def analyze_content_with_llm(csv_path: str, openai_api_key: Optional[str] = None) -> Tuple[str, int]:
     """
@@ -58,10 +87,7 @@ def analyze_content_with_llm(csv_path: str, openai_api_key: Optional[str] = None
         # Read sample of CSV data (first 5 rows)
         sample_data = []
         with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for i, row in enumerate(reader):
-                if i >= 5:  # Only analyze first 5 videos
-                    break
+            for row in islice(csv.DictReader(f), 5):  # Only analyze first 5 videos
                 sample_data.append({
                     'description': row.get('description', '')[:200],  # First 200 chars
                     'hashtags': row.get('hashtags', ''),
@@ -71,25 +97,13 @@ def analyze_content_with_llm(csv_path: str, openai_api_key: Optional[str] = None
         if not sample_data:
             return ("English", 150)
         
-        # Prepare prompt for Claude
-        newline = '\n'
-        sample_text = newline.join([f"Video {i+1}:{newline}  Description: {v['description']}{newline}  Hashtags: {v['hashtags']}{newline}  Transcript excerpt: {v['transcript'][:150]}..." for i, v in enumerate(sample_data)])
-        
-        prompt = f"""Analyze the following TikTok video data samples and suggest optimal parameters for JSONL training data conversion:
-
-Sample Data:
-{sample_text}
-
-Based on this content, please suggest:
-1. The primary language used (e.g., English, Spanish, French, etc.)
-2. An optimal maximum character limit for TikTok descriptions (typically 100-300 characters, considering TikTok's platform and the style of these videos)
-
-Respond in JSON format:
-{{
-  "language": "detected language",
-  "max_char": recommended_number,
-  "reasoning": "brief explanation"
-}}"""
+        # Prepare prompt
+        sample_text = '\n'.join(
+            LLM_ANALYSIS_SAMPLE.format(number=i, description=v['description'],
+                                       hashtags=v['hashtags'], transcript=v['transcript'][:150])
+            for i, v in enumerate(sample_data, 1)
+        )
+        prompt = LLM_ANALYSIS_PROMPT.format(samples=sample_text)
 
         client = OpenAI(api_key=api_key)
         response = client.chat.completions.create(
@@ -104,11 +118,8 @@ Respond in JSON format:
         response_text = response.choices[0].message.content
         
         # Extract JSON from response (handle markdown code blocks)
-        import json
-        import re
-        
         # Try to find JSON in code blocks first
-        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
+        json_match = JSON_BLOCK_RE.search(response_text)
         if json_match:
             response_json = json.loads(json_match.group(1))
         else:
@@ -278,13 +289,13 @@ async def process_json_file(
     # Limit to count if specified
     if count and count < len(videos):
         print(f"\n📊 Limiting to top {count} videos (sorted by view count)")
-        videos = videos[:count]
+        del videos[count:]
 
     print(f"\n✅ Processing {len(videos)} videos")
 
     # Display top videos
     print("\n📊 Top Videos:")
-    for i, video in enumerate(videos[:5], 1):
+    for i, video in enumerate(islice(videos, 5), 1):
         print(f"  {i}. ID: {video['video_id']} ({video.get('view_count', 0):,} views)")
         print(f"     {video.get('description', '')[:60]}...")
 
@@ -336,10 +347,15 @@ async def process_json_file(
     print("STEP 2: Extracting Transcripts via OpusClip")
     print("=" * 60)
 
-    opus_client = OpusClipClient(api_key=opus_api_key)
-    videos_with_transcripts = await process_videos_with_opusclip(
-        videos, opus_client, batch_size
-    )
+    # Transcripts are appended to the CSV as they arrive, so an interrupted
+    # run keeps what it finished and de-duplication skips it next time
+    output_path = generator.generate_filename(channel_name, output_dir)
+
+    async with AsyncOpusClipClient(api_key=opus_api_key) as opus_client:
+        videos_with_transcripts = await process_videos_with_opusclip(
+            videos, opus_client, batch_size,
+            csv_generator=generator, output_path=output_path
+        )
 
     if not videos_with_transcripts:
         print("❌ No transcripts extracted. Exiting.")
@@ -352,10 +368,7 @@ async def process_json_file(
     print("STEP 3: Generating CSV")
     print("=" * 60)
 
-    # Reuse generator from de-duplication check (or create if somehow not defined)
-    if 'generator' not in locals():
-        generator = CSVGenerator()
-    output_path = generator.generate_filename(channel_name, output_dir)
+    # Rewrite the incrementally appended CSV in submission order
     csv_path = generator.generate_csv(videos_with_transcripts, output_path)
 
     # Step 4: Analyze content and confirm JSONL parameters
@@ -363,8 +376,12 @@ async def process_json_file(
     print("STEP 4: Analyzing Content for JSONL Conversion")
     print("=" * 60)
 
-    # Use LLM to analyze and suggest parameters
-    suggested_language, suggested_max_char = analyze_content_with_llm(csv_path, openai_api_key)
+    # Use LLM to analyze and suggest parameters, unless the CLI already
+    # fixed both (confirm_jsonl_parameters would discard the suggestion)
+    if language is not None and max_char is not None:
+        suggested_language, suggested_max_char = language, max_char
+    else:
+        suggested_language, suggested_max_char = analyze_content_with_llm(csv_path, openai_api_key)
     
     # Get final parameters with user confirmation
     final_language, final_max_char = confirm_jsonl_parameters(
@@ -404,16 +421,21 @@ async def process_json_file(
 
 async def process_videos_with_opusclip(
     videos: List[Dict],
-    opus_client: OpusClipClient,
-    batch_size: int = 10
+    opus_client: AsyncOpusClipClient,
+    batch_size: int = 10,
+    csv_generator: Optional[CSVGenerator] = None,
+    output_path: Optional[str] = None
 ) -> List[Dict]:
     """
     Process videos in batches using OpusClip for transcript extraction.
 
     Args:
         videos: List of video metadata dicts
-        opus_client: OpusClip API client
+        opus_client: Async OpusClip API client
         batch_size: Number of videos to process in parallel
+        csv_generator: Optional CSV generator used to append each transcript
+            to output_path as soon as it is extracted
+        output_path: CSV path for the incremental appends
 
     Returns:
         List of videos with transcripts
@@ -428,21 +450,23 @@ async def process_videos_with_opusclip(
         batch = videos[i:i + batch_size]
         print(f"\n📦 Submitting batch {i // batch_size + 1} ({len(batch)} videos)")
 
-        for video in batch:
-            try:
-                video_url = video['video_url']
-                project_response = opus_client.submit_project(video_url)
-                project_id = project_response.get('projectId')
+        responses = await asyncio.gather(
+            *(opus_client.submit_project(video['video_url']) for video in batch),
+            return_exceptions=True
+        )
 
-                if project_id:
-                    video['project_id'] = project_id
-                    project_submissions.append(video)
-                    print(f"  ✅ Submitted {video['video_id']} → Project {project_id}")
-                else:
-                    print(f"  ❌ Failed to submit {video['video_id']}")
+        for video, project_response in zip(batch, responses):
+            if isinstance(project_response, Exception):
+                print(f"  ❌ Error submitting {video['video_id']}: {project_response}")
+                continue
 
-            except Exception as e:
-                print(f"  ❌ Error submitting {video['video_id']}: {e}")
+            project_id = project_response.get('projectId')
+            if project_id:
+                video['project_id'] = project_id
+                project_submissions.append(video)
+                print(f"  ✅ Submitted {video['video_id']} → Project {project_id}")
+            else:
+                print(f"  ❌ Failed to submit {video['video_id']}")
 
     if not project_submissions:
         print("❌ No projects submitted successfully")
@@ -459,16 +483,10 @@ async def process_videos_with_opusclip(
             if not project_id:
                 return None
 
-            print(f"\n{'='*60}")
-            print(f"🎬 Processing video: {video_id}")
-            print(f"   Project ID: {project_id}")
-            print(f"{'='*60}")
+            print(f"\n{'='*60}\n🎬 Processing video: {video_id}\n   Project ID: {project_id}\n{'='*60}")
 
-            # Wait for completion (run in executor to avoid blocking)
-            loop = asyncio.get_event_loop()
-            completed = await loop.run_in_executor(
-                None,
-                opus_client.wait_for_project_completion,
+            # Wait for completion
+            completed = await opus_client.wait_for_project_completion(
                 project_id,
                 600  # 10 minute timeout
             )
@@ -480,7 +498,7 @@ async def process_videos_with_opusclip(
 
             # Get exportable clips using new API
             print(f"\n📎 Fetching exportable clips for project {project_id}...")
-            exportable_clips = opus_client.get_exportable_clips(project_id)
+            exportable_clips = await opus_client.get_exportable_clips(project_id)
             print(f"   Number of clips: {len(exportable_clips)}")
             
             if not exportable_clips:
@@ -512,6 +530,8 @@ async def process_videos_with_opusclip(
                 print(f"   Project ID: {project_id}")
                 print(f"   Transcript length: {len(transcript)} chars")
                 print(f"   Preview: {transcript[:100]}...")
+                if csv_generator and output_path:
+                    csv_generator.append_row(video, output_path)
                 return video
             else:
                 print(f"\n⚠️  Empty transcript for video {video_id}")
@@ -522,14 +542,29 @@ async def process_videos_with_opusclip(
             print(f"   Project ID: {video.get('project_id')}")
             print(f"   Error type: {type(e).__name__}")
             print(f"   Error message: {str(e)}")
-            import traceback
             print(f"   Full traceback:")
             print(traceback.format_exc())
 
         return None
 
+    # Report progress as each project finishes; gather keeps results in
+    # submission order
+    finished = 0
+    succeeded = 0
+
+    async def wait_and_report(video):
+        nonlocal finished, succeeded
+        try:
+            result = await wait_and_extract(video)
+        finally:
+            finished += 1
+        if result is not None:
+            succeeded += 1
+        print(f"\n📊 Progress: {finished}/{len(project_submissions)} projects finished ({succeeded} transcripts)")
+        return result
+
     # Process all in parallel
-    tasks = [wait_and_extract(video) for video in project_submissions]
+    tasks = [wait_and_report(video) for video in project_submissions]
     results = await asyncio.gather(*tasks, return_exceptions=True)
 
     # Filter out None and exceptions
@@ -691,7 +726,6 @@ Notes:
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ Error: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 
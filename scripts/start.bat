@@ -50,6 +50,15 @@ REM Start backend in new window
 echo 🚀 Starting backend...
 start "BrandVoice Backend" cmd /k python api\server.py
 
+REM Start the job worker when a Redis job queue is configured
+if defined REDIS_URL (
+    python -c "import arq" 2>nul
+    if not errorlevel 1 (
+        echo 🚀 Starting job worker...
+        start "BrandVoice Worker" cmd /k arq api.worker.WorkerSettings
+    )
+)
+
 REM Wait a moment for backend to start
 timeout /t 3 /nobreak >nul
 
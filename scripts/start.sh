@@ -49,7 +49,7 @@ echo ""
 cleanup() {
     echo ""
     echo "Stopping servers..."
-    kill $BACKEND_PID $FRONTEND_PID 2>/dev/null
+    kill $BACKEND_PID $FRONTEND_PID $WORKER_PID 2>/dev/null
     exit
 }
 
@@ -60,6 +60,14 @@ echo "🚀 Starting backend..."
 python api/server.py &
 BACKEND_PID=$!
 
+# Start the job worker when a Redis job queue is configured
+WORKER_PID=""
+if [ -n "$REDIS_URL" ] && python -c "import arq" 2>/dev/null; then
+    echo "🚀 Starting job worker..."
+    arq api.worker.WorkerSettings &
+    WORKER_PID=$!
+fi
+
 # Wait a moment for backend to start
 sleep 3
 
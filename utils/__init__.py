@@ -1,8 +1,15 @@
 """Utility modules for TikTok scraper."""
 
 from .csv_generator import CSVGenerator
-# from .transcript_extractor import TranscriptExtractor  # Commented out - requires scrapers module
 from .json_processor import TikTokJSONProcessor
 from .jsonl_converter import JSONLConverter
 
 __all__ = ['CSVGenerator', 'TikTokJSONProcessor', 'JSONLConverter']
+
+
+def __getattr__(name):
+    # TranscriptExtractor needs the scrapers module, so only import it on use
+    if name == 'TranscriptExtractor':
+        from .transcript_extractor import TranscriptExtractor
+        return TranscriptExtractor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,8 +6,24 @@ CSV Generator for TikTok scraping results
 import csv
 import os
 import glob
-from typing import List, Dict, Set
-from datetime import datetime
+import time
+from typing import List, Dict, Set, Optional
+
+from . import json_compat
+
+# I/O buffer for CSVs written or read start to finish (the default is 8 KiB)
+FILE_BUFFER_SIZE = 1024 * 1024
+
+# Hidden per-channel file in the output directory caching each CSV's video IDs,
+# keyed by file name and tagged with its size and mtime, so repeat scans only
+# parse CSVs that are new or have changed since the last run
+VIDEO_IDS_CACHE_NAME = ".{channel}_video_ids.json"
+
+# polars (optional) reads just the video_id column in its native parser
+try:
+    import polars as pl
+except ImportError:
+    pl = None
 
 
 class CSVGenerator:
@@ -40,6 +56,30 @@ class CSVGenerator:
             return ""
         return ', '.join(hashtags)
 
+    def prepare_values(self, video: Dict) -> tuple:
+        """
+        Prepare a video dictionary as a CSV row in fieldnames order.
+
+        Args:
+            video: Video metadata dictionary
+
+        Returns:
+            Tuple of column values matching self.fieldnames
+        """
+        return (
+            video.get('video_id', ''),
+            video.get('video_url', ''),
+            video.get('transcript', ''),
+            video.get('description', ''),
+            self.format_hashtags(video.get('hashtags', [])),
+            video.get('view_count', 0),
+            video.get('like_count', 0),
+            video.get('comment_count', 0),
+            video.get('share_count', 0),
+            video.get('duration', 0),
+            video.get('transcript_source', 'unknown'),
+        )
+
     def prepare_row(self, video: Dict) -> Dict:
         """
         Prepare a video dictionary for CSV export.
@@ -50,19 +90,7 @@ class CSVGenerator:
         Returns:
             Formatted dictionary matching CSV fieldnames
         """
-        return {
-            'video_id': video.get('video_id', ''),
-            'video_url': video.get('video_url', ''),
-            'transcript': video.get('transcript', ''),
-            'description': video.get('description', ''),
-            'hashtags': self.format_hashtags(video.get('hashtags', [])),
-            'view_count': video.get('view_count', 0),
-            'like_count': video.get('like_count', 0),
-            'comment_count': video.get('comment_count', 0),
-            'share_count': video.get('share_count', 0),
-            'duration': video.get('duration', 0),
-            'transcript_source': video.get('transcript_source', 'unknown'),
-        }
+        return dict(zip(self.fieldnames, self.prepare_values(video)))
 
     def generate_csv(self, videos: List[Dict], output_path: str) -> str:
         """
@@ -83,24 +111,30 @@ class CSVGenerator:
         os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
 
         try:
-            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=self.fieldnames)
+            with open(output_path, 'w', newline='', encoding='utf-8', buffering=FILE_BUFFER_SIZE) as csvfile:
+                # Plain csv.writer with tuples in fieldnames order, so rows
+                # don't go through DictWriter's per-row dict-to-list step
+                writer = csv.writer(csvfile)
 
                 # Write header
-                writer.writeheader()
+                writer.writerow(self.fieldnames)
 
-                # Write rows
-                for video in videos:
-                    row = self.prepare_row(video)
-                    writer.writerow(row)
+                # Write rows in one call so the loop runs inside the csv module
+                writer.writerows(map(self.prepare_values, videos))
 
             print(f"✅ CSV exported: {output_path}")
             print(f"   📊 {len(videos)} videos written")
 
-            # Calculate statistics
-            tiktok_captions = sum(1 for v in videos if v.get('transcript_source') == 'tiktok_captions')
-            opusclip = sum(1 for v in videos if v.get('transcript_source') == 'opusclip')
-            none = sum(1 for v in videos if v.get('transcript_source') in ['none', 'error'])
+            # Calculate statistics in one pass over the videos
+            tiktok_captions = opusclip = none = 0
+            for v in videos:
+                source = v.get('transcript_source')
+                if source == 'tiktok_captions':
+                    tiktok_captions += 1
+                elif source == 'opusclip':
+                    opusclip += 1
+                elif source == 'none' or source == 'error':
+                    none += 1
 
             print(f"   🔤 TikTok captions: {tiktok_captions}")
             print(f"   🎬 OpusClip: {opusclip}")
@@ -113,6 +147,25 @@ class CSVGenerator:
             print(f"❌ Error generating CSV: {e}")
             raise
 
+    def append_row(self, video: Dict, output_path: str) -> None:
+        """
+        Append one video to a CSV file, writing the header if the file is new.
+
+        Lets long runs persist each transcript as soon as it is extracted;
+        generate_csv() can later rewrite the same path with the full set.
+
+        Args:
+            video: Video metadata dictionary
+            output_path: Path to output CSV file
+        """
+        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
+
+        with open(output_path, 'a', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            if csvfile.tell() == 0:
+                writer.writerow(self.fieldnames)
+            writer.writerow(self.prepare_values(video))
+
     def generate_filename(self, username: str, output_dir: str = "output") -> str:
         """
         Generate a timestamped filename for the CSV.
@@ -124,7 +177,7 @@ class CSVGenerator:
         Returns:
             Full path to output file
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         filename = f"{username}_{timestamp}.csv"
         return os.path.join(output_dir, filename)
 
@@ -133,7 +186,8 @@ class CSVGenerator:
         Get all video IDs that have already been processed for a channel.
         
         Searches for all CSV files matching {channel_name}_*.csv pattern
-        and extracts all video IDs from them.
+        and extracts all video IDs from them. IDs read from each file are
+        cached next to the CSVs, so only new or modified files are parsed.
 
         Args:
             channel_name: TikTok channel/username
@@ -155,29 +209,123 @@ class CSVGenerator:
         if not csv_files:
             return existing_ids
         
-        # Read each CSV file and extract video IDs
+        cache_path = os.path.join(output_dir, VIDEO_IDS_CACHE_NAME.format(channel=channel_name))
+        cache = self.load_video_ids_cache(cache_path)
+        updated_cache = {}
+        changed = False
+        
+        # Read each new or modified CSV file and extract video IDs
         for csv_file in csv_files:
+            name = os.path.basename(csv_file)
             try:
-                with open(csv_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    
-                    # Check if video_id column exists
-                    if 'video_id' not in reader.fieldnames:
-                        print(f"⚠️  Warning: No 'video_id' column in {os.path.basename(csv_file)}")
-                        continue
-                    
-                    # Extract all video IDs
-                    for row in reader:
-                        video_id = row.get('video_id', '').strip()
-                        if video_id:
-                            existing_ids.add(video_id)
-                            
-            except Exception as e:
-                print(f"⚠️  Warning: Error reading {os.path.basename(csv_file)}: {e}")
+                stat = os.stat(csv_file)
+            except OSError:
                 continue
+            stamp = [stat.st_size, stat.st_mtime_ns]
+            
+            entry = cache.get(name)
+            if entry is None or entry.get('stamp') != stamp:
+                video_ids = self.read_video_id_column(csv_file)
+                if video_ids is None:
+                    continue
+                entry = {'stamp': stamp, 'ids': video_ids}
+                changed = True
+            
+            updated_cache[name] = entry
+            existing_ids.update(entry['ids'])
+        
+        # Also rewrite when CSVs were removed since the cache was saved
+        if changed or len(updated_cache) != len(cache):
+            self.save_video_ids_cache(cache_path, updated_cache)
         
         return existing_ids
 
+    def load_video_ids_cache(self, cache_path: str) -> Dict:
+        """
+        Load the per-file video ID cache for a channel.
+
+        Args:
+            cache_path: Path to the cache file
+
+        Returns:
+            Dictionary mapping CSV file names to {'stamp', 'ids'} entries,
+            empty if the cache is missing or unreadable
+        """
+        try:
+            with open(cache_path, 'rb') as f:
+                cache = json_compat.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def save_video_ids_cache(self, cache_path: str, cache: Dict) -> None:
+        """
+        Write the per-file video ID cache, replacing any previous version.
+
+        A failed write only costs a rescan next time, so it is not raised.
+
+        Args:
+            cache_path: Path to the cache file
+            cache: Dictionary mapping CSV file names to {'stamp', 'ids'} entries
+        """
+        tmp_path = f"{cache_path}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(json_compat.dumps(cache))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write video ID cache {os.path.basename(cache_path)}: {e}")
+
+    def read_video_id_column(self, csv_file: str) -> Optional[List[str]]:
+        """
+        Read the non-empty video IDs from one CSV file.
+
+        Only the video_id column is kept; rows are never built as dicts.
+
+        Args:
+            csv_file: Path to a CSV file
+
+        Returns:
+            List of video ID strings, or None if the file has no
+            video_id column or can't be read
+        """
+        if pl is not None:
+            try:
+                # Read as text so IDs keep their exact digits
+                video_ids = (
+                    pl.scan_csv(csv_file, infer_schema_length=0)
+                    .select(pl.col('video_id').str.strip_chars())
+                    .filter(pl.col('video_id') != '')
+                    .collect()
+                )
+                return video_ids['video_id'].to_list()
+            except Exception:
+                pass  # e.g. a missing column; use the csv module below for its warning
+
+        try:
+            with open(csv_file, 'r', encoding='utf-8', newline='', buffering=FILE_BUFFER_SIZE) as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+
+                # Check if video_id column exists
+                if 'video_id' not in header:
+                    print(f"⚠️  Warning: No 'video_id' column in {os.path.basename(csv_file)}")
+                    return None
+
+                # Extract all video IDs
+                id_col = header.index('video_id')
+                video_ids = []
+                for row in reader:
+                    if id_col < len(row):
+                        video_id = row[id_col].strip()
+                        if video_id:
+                            video_ids.append(video_id)
+                return video_ids
+
+        except Exception as e:
+            print(f"⚠️  Warning: Error reading {os.path.basename(csv_file)}: {e}")
+            return None
+
 
 def test_csv_generator():
     """Test CSV generation with sample data."""
@@ -5,9 +5,23 @@ Extracts video IDs and metadata for transcript extraction
 """
 
 import json
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional
 import os
 
+from . import json_compat
+
+# ijson lets process_json_file stream itemList one video at a time instead of
+# building the whole document in memory; fall back to a full load without it
+try:
+    import ijson
+    from ijson.common import JSONError as IJSONError
+    try:
+        ijson = ijson.get_backend('yajl2_c')
+    except ImportError:
+        pass
+except ImportError:
+    ijson = None
+
 
 class TikTokJSONProcessor:
     def __init__(self):
@@ -15,7 +29,10 @@ class TikTokJSONProcessor:
 
     def extract_video_ids(self, json_data: dict) -> List[str]:
         """
-        Recursively extract all "id" fields from JSON data.
+        Extract all "id" fields from anywhere in the JSON data.
+
+        Walks the document with an explicit stack, so deeply nested
+        payloads can't hit the recursion limit.
 
         Args:
             json_data: Parsed JSON dictionary
@@ -24,9 +41,14 @@ class TikTokJSONProcessor:
             List of unique video IDs
         """
         video_ids = set()
-
-        def recurse_extract(obj):
-            if isinstance(obj, dict):
+        stack = [json_data]
+
+        while stack:
+            obj = stack.pop()
+            # Parsed JSON only holds plain dicts and lists, so exact type
+            # checks are enough and skip isinstance's subclass handling
+            obj_type = type(obj)
+            if obj_type is dict:
                 # Check if this dict has an "id" field
                 if 'id' in obj:
                     video_id = str(obj['id'])
@@ -34,16 +56,13 @@ class TikTokJSONProcessor:
                     if len(video_id) >= 15:
                         video_ids.add(video_id)
 
-                # Recurse through all values
-                for value in obj.values():
-                    recurse_extract(value)
+                # Visit all values
+                stack.extend(obj.values())
 
-            elif isinstance(obj, list):
-                for item in obj:
-                    recurse_extract(item)
+            elif obj_type is list:
+                stack.extend(obj)
 
-        recurse_extract(json_data)
-        return sorted(list(video_ids))
+        return sorted(video_ids)
 
     def parse_video_metadata(self, json_data: dict) -> List[Dict]:
         """
@@ -75,56 +94,99 @@ class TikTokJSONProcessor:
         # Parse full metadata from itemList
         for item in item_list:
             try:
-                video_id = str(item.get('id', ''))
-                author = item.get('author', {})
-                username = author.get('uniqueId', 'unknown')
-                stats = item.get('stats', {})
-                video_data = item.get('video', {})
-
-                # Extract description and hashtags from contents or direct fields
-                description = item.get('desc', '')
-                text_extra = item.get('textExtra', [])
-
-                # Check if desc and textExtra are in contents array
-                if 'contents' in item and isinstance(item['contents'], list) and len(item['contents']) > 0:
-                    content = item['contents'][0]
-                    description = content.get('desc', description)
-                    text_extra = content.get('textExtra', text_extra)
-
-                # Extract hashtags from challenges or textExtra
-                hashtags = []
-
-                # Try challenges first
-                if 'challenges' in item:
-                    hashtags = [c.get('title', '') for c in item['challenges'] if c.get('title')]
-
-                # Also check textExtra
-                if text_extra:
-                    text_hashtags = [tag.get('hashtagName', '') for tag in text_extra if tag.get('hashtagName')]
-                    hashtags.extend([h for h in text_hashtags if h not in hashtags])
-
-                video_info = {
-                    'video_id': video_id,
-                    'video_url': f"https://www.tiktok.com/@{username}/video/{video_id}",
-                    'description': description,
-                    'hashtags': hashtags,
-                    'view_count': stats.get('playCount', 0),
-                    'like_count': stats.get('diggCount', 0),
-                    'comment_count': stats.get('commentCount', 0),
-                    'share_count': stats.get('shareCount', 0),
-                    'has_captions': bool(video_data.get('subtitleInfos')),
-                    'duration': video_data.get('duration', 0),
-                    'create_time': item.get('createTime', 0),
-                }
-
-                videos.append(video_info)
-
+                videos.append(self.parse_video_item(item))
             except Exception as e:
                 print(f"⚠️  Error parsing video item: {e}")
                 continue
 
         return videos
 
+    def parse_video_item(self, item: Dict) -> Dict:
+        """
+        Parse metadata for a single itemList entry.
+
+        Args:
+            item: Video item dictionary from TikTok API itemList
+
+        Returns:
+            Video metadata dictionary
+        """
+        video_id = str(item.get('id', ''))
+        author = item.get('author', {})
+        username = author.get('uniqueId', 'unknown')
+        stats = item.get('stats', {})
+        video_data = item.get('video', {})
+
+        # Extract description and hashtags from contents or direct fields
+        description = item.get('desc', '')
+        text_extra = item.get('textExtra', [])
+
+        # Check if desc and textExtra are in contents array
+        if 'contents' in item and isinstance(item['contents'], list) and len(item['contents']) > 0:
+            content = item['contents'][0]
+            description = content.get('desc', description)
+            text_extra = content.get('textExtra', text_extra)
+
+        # Extract hashtags from challenges or textExtra
+        hashtags = []
+
+        # Try challenges first
+        if 'challenges' in item:
+            hashtags = [c.get('title', '') for c in item['challenges'] if c.get('title')]
+
+        # Also check textExtra, skipping tags already taken from challenges;
+        # the set keeps that check O(1) on tag-heavy videos
+        if text_extra:
+            from_challenges = set(hashtags)
+            text_hashtags = [tag.get('hashtagName', '') for tag in text_extra if tag.get('hashtagName')]
+            hashtags.extend([h for h in text_hashtags if h not in from_challenges])
+
+        return {
+            'video_id': video_id,
+            'video_url': f"https://www.tiktok.com/@{username}/video/{video_id}",
+            'description': description,
+            'hashtags': hashtags,
+            'view_count': stats.get('playCount', 0),
+            'like_count': stats.get('diggCount', 0),
+            'comment_count': stats.get('commentCount', 0),
+            'share_count': stats.get('shareCount', 0),
+            'has_captions': bool(video_data.get('subtitleInfos')),
+            'duration': video_data.get('duration', 0),
+            'create_time': item.get('createTime', 0),
+        }
+
+    def stream_video_metadata(self, file_path: str) -> Optional[List[Dict]]:
+        """
+        Parse video metadata by streaming itemList (or data.itemList) with ijson.
+
+        Only one raw item is held in memory at a time.
+
+        Args:
+            file_path: Path to JSON file
+
+        Returns:
+            List of video metadata dictionaries, or None if the file has no
+            non-empty itemList (or can't be streamed), so the caller should
+            fall back to a full load
+        """
+        for prefix in ('itemList.item', 'data.itemList.item'):
+            videos = []
+            try:
+                with open(file_path, 'rb') as f:
+                    for item in ijson.items(f, prefix, use_float=True):
+                        try:
+                            videos.append(self.parse_video_item(item))
+                        except Exception as e:
+                            print(f"⚠️  Error parsing video item: {e}")
+                            continue
+            except (OSError, IJSONError):
+                return None
+
+            if videos:
+                return videos
+
+        return None
+
     def load_json_file(self, file_path: str) -> Dict:
         """
         Load and parse JSON file.
@@ -136,8 +198,8 @@ class TikTokJSONProcessor:
             Parsed JSON dictionary
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(file_path, 'rb') as f:
+                data = json_compat.loads(f.read())
             return data
         except FileNotFoundError:
             print(f"❌ File not found: {file_path}")
@@ -161,16 +223,23 @@ class TikTokJSONProcessor:
         """
         print(f"📄 Loading JSON file: {file_path}")
 
-        # Load JSON
-        json_data = self.load_json_file(file_path)
-        if not json_data:
-            return []
+        videos = None
+        if ijson is not None:
+            # Stream itemList when possible; other layouts need the full document
+            print("🔍 Streaming video metadata...")
+            videos = self.stream_video_metadata(file_path)
+
+        if videos is None:
+            # Load JSON
+            json_data = self.load_json_file(file_path)
+            if not json_data:
+                return []
 
-        print("✅ JSON loaded successfully")
+            print("✅ JSON loaded successfully")
 
-        # Try to parse full metadata first
-        print("🔍 Parsing video metadata...")
-        videos = self.parse_video_metadata(json_data)
+            # Try to parse full metadata first
+            print("🔍 Parsing video metadata...")
+            videos = self.parse_video_metadata(json_data)
 
         if not videos:
             print("⚠️  No videos found in standard format")
@@ -7,6 +7,12 @@ import csv
 import json
 from typing import List, Dict, Optional
 
+from . import json_compat
+
+# I/O buffer for the CSV read and JSONL write (the default is 8 KiB). Each
+# example embeds the multi-KB system message, so this saves a write per row
+FILE_BUFFER_SIZE = 1024 * 1024
+
 
 class JSONLConverter:
     def __init__(self, language: str = "English", max_char: int = 10, style: str = ""):
@@ -23,6 +29,22 @@ class JSONLConverter:
         self.style = style
         self.system_message = self._build_system_message()
 
+        # Every example carries the same system instruction, so build it
+        # once and share it instead of a new dict per row
+        self._system_instruction = {
+            "role": "system",
+            "parts": [{"text": self.system_message}]
+        }
+
+        # ...and serialize it once: each JSONL line is the row's "contents"
+        # JSON followed by this fixed tail (same bytes as dumping the example)
+        self._example_suffix = b',"systemInstruction":' + json_compat.dumps(self._system_instruction) + b'}\n'
+
+        # The user input JSON only varies by transcript, so serialize the
+        # fixed language/max_char parts once (same output as json.dumps)
+        self._user_text_prefix = '{"language": ' + json.dumps(self.language) + ', "text": '
+        self._user_text_suffix = ', "max_char": ' + json.dumps(self.max_char) + '}'
+
     def _build_system_message(self) -> str:
         """Build the system instruction message with style injected."""
         base_message = """[SYSTEM MESSAGE]
@@ -167,32 +189,30 @@ class JSONLConverter:
 
         return message
 
-    def csv_row_to_training_example(self, row: Dict) -> Dict:
+    def csv_row_to_training_example(self, row: Dict, transcript: Optional[str] = None) -> Dict:
         """
         Convert a CSV row to a training example in the required format.
 
         Args:
             row: Dictionary with keys from CSV (video_id, transcript, description, hashtags, etc.)
+            transcript: The row's already-stripped transcript, if the caller has it
 
         Returns:
             Training example dictionary in the required format
         """
-        transcript = row.get('transcript', '').strip()
+        if transcript is None:
+            transcript = row.get('transcript', '').strip()
         description = row.get('description', '').strip()
         hashtags_str = row.get('hashtags', '').strip()
 
         # Parse hashtags from comma-separated string
         if hashtags_str:
-            hashtags = [tag.strip() for tag in hashtags_str.split(',') if tag.strip()]
+            hashtags = [tag for tag in map(str.strip, hashtags_str.split(',')) if tag]
         else:
             hashtags = []
 
-        # Build user input JSON
-        user_input = {
-            "language": self.language,
-            "text": transcript,
-            "max_char": self.max_char
-        }
+        # Build user input JSON ({"language", "text", "max_char"})
+        user_text = self._user_text_prefix + json.dumps(transcript) + self._user_text_suffix
 
         # Build model output JSON
         model_output = {
@@ -205,17 +225,14 @@ class JSONLConverter:
             "contents": [
                 {
                     "role": "user",
-                    "parts": [{"text": json.dumps(user_input)}]
+                    "parts": [{"text": user_text}]
                 },
                 {
                     "role": "model",
                     "parts": [{"text": json.dumps(model_output)}]
                 }
             ],
-            "systemInstruction": {
-                "role": "system",
-                "parts": [{"text": self.system_message}]
-            }
+            "systemInstruction": self._system_instruction
         }
 
         return training_example
@@ -233,37 +250,37 @@ class JSONLConverter:
         """
         import os
 
-        examples = []
+        # Create output directory and use CSV filename for the JSONL file
+        csv_basename = os.path.splitext(os.path.basename(csv_path))[0]
+        output_dir = os.path.dirname(output_path) or 'training_data'
+
+        # Use CSV filename with .jsonl extension
+        final_output_path = os.path.join(output_dir, f"{csv_basename}.jsonl")
 
         try:
-            with open(csv_path, 'r', encoding='utf-8') as csvfile:
+            with open(csv_path, 'r', encoding='utf-8', buffering=FILE_BUFFER_SIZE) as csvfile:
                 reader = csv.DictReader(csvfile)
-
-                for row in reader:
-                    # Skip rows without transcript
-                    if not row.get('transcript', '').strip():
-                        continue
-
-                    training_example = self.csv_row_to_training_example(row)
-                    examples.append(training_example)
-
-            # Create output directory and use CSV filename for the JSONL file
-            csv_basename = os.path.splitext(os.path.basename(csv_path))[0]
-            output_dir = os.path.dirname(output_path) or 'training_data'
-            os.makedirs(output_dir, exist_ok=True)
-
-            # Use CSV filename with .jsonl extension
-            final_output_path = os.path.join(output_dir, f"{csv_basename}.jsonl")
-
-            # Write to JSONL (one JSON object per line)
-            with open(final_output_path, 'w', encoding='utf-8') as jsonlfile:
-                for example in examples:
-                    jsonlfile.write(json.dumps(example, ensure_ascii=False) + '\n')
-
-            print(f"✅ Converted {len(examples)} examples to JSONL")
+                os.makedirs(output_dir, exist_ok=True)
+
+                # Write each example as its row is read (one JSON object per
+                # line), serialized straight to UTF-8 bytes; only "contents"
+                # varies per row, so the system instruction is spliced in
+                count = 0
+                with open(final_output_path, 'wb', buffering=FILE_BUFFER_SIZE) as jsonlfile:
+                    for row in reader:
+                        # Skip rows without transcript
+                        transcript = row.get('transcript', '').strip()
+                        if not transcript:
+                            continue
+
+                        training_example = self.csv_row_to_training_example(row, transcript)
+                        jsonlfile.write(b'{"contents":' + json_compat.dumps(training_example['contents']) + self._example_suffix)
+                        count += 1
+
+            print(f"✅ Converted {count} examples to JSONL")
             print(f"📄 Output: {final_output_path}")
 
-            return len(examples)
+            return count
 
         except FileNotFoundError:
             print(f"❌ CSV file not found: {csv_path}")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+State storage for the API server (uploads and processing jobs)
+
+Uses Redis when REDIS_URL is set. Otherwise state is kept in a local
+SQLite database (STATE_DB, default state.db), which is shared between
+uvicorn workers on the same host and survives restarts. Set STATE_DB to
+an empty string to keep state in process memory only.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+
+from . import json_compat
+
+
+# Expired entries are also swept out at most this often, so keys that are
+# never read again don't accumulate
+PURGE_INTERVAL = 3600
+
+
+class MemoryStateStore:
+    """Process-local store. Values are kept by reference."""
+
+    def __init__(self, default_ttl: int = 86400):
+        self._data = {}
+        self.default_ttl = default_ttl
+        self._next_purge = time.monotonic() + PURGE_INTERVAL
+
+    def _purge(self, now: float) -> None:
+        expired = [key for key, (_, expires_at) in self._data.items() if expires_at <= now]
+        for key in expired:
+            del self._data[key]
+        self._next_purge = now + PURGE_INTERVAL
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        now = time.monotonic()
+        if now >= self._next_purge:
+            self._purge(now)
+        self._data[key] = (value, now + (ttl or self.default_ttl))
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def keys(self, prefix: str) -> List[str]:
+        now = time.monotonic()
+        return [key for key, (_, expires_at) in self._data.items() if key.startswith(prefix) and expires_at > now]
+
+
+class RedisStateStore:
+    """Redis-backed store. Values are stored as JSON with an expiry."""
+
+    def __init__(self, url: str, default_ttl: int = 86400):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self.default_ttl = default_ttl
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._redis.get(key)
+        if raw is None:
+            return None
+        return json_compat.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        await self._redis.set(key, json_compat.dumps(value), ex=ttl or self.default_ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(key)
+
+    async def keys(self, prefix: str) -> List[str]:
+        return [key.decode() async for key in self._redis.scan_iter(match=f"{prefix}*")]
+
+
+class SQLiteStateStore:
+    """SQLite-backed store. Values are stored as JSON with an expiry."""
+
+    def __init__(self, path: str, default_ttl: int = 86400):
+        self.default_ttl = default_ttl
+        # Autocommit + WAL: each write is its own short transaction and
+        # readers in other workers aren't blocked by the writer
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        # Writes go through one thread, in the order they were made, so
+        # concurrent saves of the same key can't land out of order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='state-writer')
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS state ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._purge()
+
+    def _purge(self) -> None:
+        # Caller holds the lock
+        now = time.time()
+        self._conn.execute('DELETE FROM state WHERE expires_at <= ?', (now,))
+        self._next_purge = now + PURGE_INTERVAL
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value FROM state WHERE key = ? AND expires_at > ?', (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: bytes, ttl: int) -> None:
+        with self._lock:
+            if time.time() >= self._next_purge:
+                self._purge()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, value, time.time() + ttl)
+            )
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM state WHERE key = ?', (key,))
+
+    def _keys(self, prefix: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT key FROM state WHERE substr(key, 1, ?) = ? AND expires_at > ?',
+                (len(prefix), prefix, time.time())
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await asyncio.to_thread(self._get, key)
+        if raw is None:
+            return None
+        return json_compat.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._writer, self._set, key, json_compat.dumps(value), ttl or self.default_ttl)
+
+    async def delete(self, key: str) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._writer, self._delete, key)
+
+    async def keys(self, prefix: str) -> List[str]:
+        return await asyncio.to_thread(self._keys, prefix)
+
+
+def create_state_store():
+    """
+    Create the state store configured by the environment.
+
+    Returns:
+        RedisStateStore if REDIS_URL is set and redis is installed,
+        otherwise SQLiteStateStore at STATE_DB (MemoryStateStore if empty)
+    """
+    redis_url = os.getenv('REDIS_URL')
+    if redis_url:
+        try:
+            return RedisStateStore(redis_url)
+        except ImportError:
+            print("⚠️  REDIS_URL is set but the redis package is not installed. Using local state.")
+
+    state_db = os.getenv('STATE_DB', 'state.db')
+    if state_db:
+        return SQLiteStateStore(state_db)
+    return MemoryStateStore()
@@ -4,49 +4,217 @@ Hybrid Transcript Extractor - Uses TikTok captions first, falls back to OpusClip
 """
 
 import asyncio
-from typing import List, Dict, Optional
+import base64
+import contextlib
+import random
+import time
+import zlib
+from typing import AsyncIterator, List, Dict, Optional
 from scrapers.tiktok_scraper import TikTokScraper
 from clients.opus_client import OpusClipClient
 
+from .state_store import create_state_store
+
+# Extracted transcripts are cached by video ID in the state store, so re-runs
+# and overlapping inputs don't re-scrape or re-submit (and pay for) a video
+TRANSCRIPT_CACHE_TTL = 30 * 86400
+
+# Cached transcripts of at least this many bytes are stored zlib-compressed
+# (base64 in the JSON value); plain transcript text shrinks by about a third
+TRANSCRIPT_COMPRESS_MIN_BYTES = 1024
+
+# OpusClip fallback jobs are started no faster than this, so a run of
+# caption-less videos doesn't burst submissions and hit 429s
+OPUS_SUBMISSIONS_PER_MINUTE = 30
+
+# Caption fetches that fail with a network error or timeout are retried with
+# jittered exponential backoff. The OpusClip fallback isn't retried here: a
+# retry would submit (and pay for) a second project
+CAPTION_RETRIES = 3
+CAPTION_RETRY_BACKOFF = 1.0
+MAX_CAPTION_RETRY_DELAY = 30.0
+
+# Videos with TikTok captions usually finish in seconds, so they get their
+# own, wider concurrency limit instead of queueing behind OpusClip jobs
+CAPTION_CONCURRENCY = 32
+
+# Seconds before a single caption fetch attempt is abandoned, so a hung
+# request can't hold its concurrency slot indefinitely
+CAPTION_TIMEOUT = 15
+
 
 class TranscriptExtractor:
-    def __init__(self, opus_api_key: Optional[str] = None):
+    def __init__(self, opus_api_key: Optional[str] = None, state_store=None,
+                 opus_submissions_per_minute: float = OPUS_SUBMISSIONS_PER_MINUTE):
+        """
+        Initialize the transcript extractor.
+
+        Args:
+            opus_api_key: OpusClip API key (default: OPUSCLIP_API_KEY)
+            state_store: Store for cached transcripts (default: create_state_store())
+            opus_submissions_per_minute: Most OpusClip jobs to start per minute (0 for no limit)
+        """
         self.scraper = TikTokScraper()
         self.opus_client = OpusClipClient(api_key=opus_api_key)
+        self.state_store = state_store if state_store is not None else create_state_store()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._opus_interval = 60.0 / opus_submissions_per_minute if opus_submissions_per_minute > 0 else 0.0
+        self._next_opus_at = 0.0
+        # Extractions currently running, by video ID, and how many callers
+        # are waiting on each
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+
+    async def _throttle_opus(self):
+        # Reserve the next submission slot; no await between read and update,
+        # so concurrent videos each get their own slot
+        now = time.monotonic()
+        wait = self._next_opus_at - now
+        self._next_opus_at = max(now, self._next_opus_at) + self._opus_interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def cache_transcript(self, video_info: Dict) -> None:
+        """Store a video's extracted transcript and its source."""
+        entry = {'source': video_info['transcript_source']}
+        encoded = video_info['transcript'].encode('utf-8')
+        if len(encoded) >= TRANSCRIPT_COMPRESS_MIN_BYTES:
+            entry['transcript_zlib'] = base64.b64encode(zlib.compress(encoded)).decode('ascii')
+        else:
+            entry['transcript'] = video_info['transcript']
 
-    async def extract_transcript(self, video_info: Dict, username: str) -> Dict:
+        await self.state_store.set(f"transcript:{video_info['video_id']}", entry, ttl=TRANSCRIPT_CACHE_TTL)
+
+    async def get_cached_transcript(self, video_id: str) -> Optional[Dict]:
+        """
+        Look up a video's cached transcript.
+
+        Args:
+            video_id: TikTok video ID
+
+        Returns:
+            Dictionary with 'transcript' and 'source', or None if not cached
+        """
+        entry = await self.state_store.get(f"transcript:{video_id}")
+        if entry is None:
+            return None
+        if 'transcript_zlib' in entry:
+            transcript = zlib.decompress(base64.b64decode(entry['transcript_zlib'])).decode('utf-8')
+        else:
+            transcript = entry['transcript']
+        return {'transcript': transcript, 'source': entry['source']}
+
+    async def fetch_captions(self, video_id: str, username: str) -> Optional[str]:
+        """
+        Fetch a video's TikTok captions, retrying transient failures.
+
+        Args:
+            video_id: TikTok video ID
+            username: TikTok username
+
+        Returns:
+            Caption text, or None if the video has none
+        """
+        for attempt in range(CAPTION_RETRIES + 1):
+            try:
+                return await asyncio.wait_for(self.scraper.get_video_captions(video_id, username), CAPTION_TIMEOUT)
+            except (OSError, asyncio.TimeoutError) as e:
+                if attempt == CAPTION_RETRIES:
+                    raise
+                delay = min(CAPTION_RETRY_BACKOFF * (2 ** attempt), MAX_CAPTION_RETRY_DELAY)
+                delay += random.uniform(0, CAPTION_RETRY_BACKOFF)
+                print(f"⚠️  Caption fetch for {video_id} failed ({type(e).__name__}: {e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def extract_transcript(self, video_info: Dict, username: str,
+                                 opus_semaphore: Optional[asyncio.Semaphore] = None) -> Dict:
         """
         Extract transcript for a single video.
         Try TikTok captions first, fall back to OpusClip if unavailable.
 
+        If the same video ID is already being extracted (e.g. it appears twice
+        in the input), this waits for that extraction instead of starting
+        another one. The shared extraction is cancelled only once every
+        caller waiting on it has been cancelled.
+
         Args:
             video_info: Video metadata dictionary
             username: TikTok username
+            opus_semaphore: Held around the OpusClip fallback, if given
 
         Returns:
             Updated video_info with transcript and source
         """
         video_id = video_info['video_id']
+
+        task = self._inflight.get(video_id)
+        if task is None:
+            task = asyncio.ensure_future(self._extract_transcript(video_info, username, opus_semaphore))
+            self._inflight[video_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(video_id, None))
+
+        # Shielded so one caller being cancelled doesn't cancel the shared
+        # extraction for the others; the last caller to leave cancels it
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            result = await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                task.cancel()  # no-op once it has finished
+        if result is not video_info:
+            video_info['transcript'] = result['transcript']
+            video_info['transcript_source'] = result['transcript_source']
+        return video_info
+
+    async def _extract_transcript(self, video_info: Dict, username: str,
+                                  opus_semaphore: Optional[asyncio.Semaphore] = None) -> Dict:
+        """Extract one video's transcript; see extract_transcript()."""
+        video_id = video_info['video_id']
         video_url = video_info['video_url']
 
+        # Reuse a transcript extracted by an earlier run
+        cached = await self.get_cached_transcript(video_id)
+        if cached is not None:
+            self.cache_hits += 1
+            print(f"♻️  Using cached transcript for {video_id} ({cached['source']})")
+            video_info['transcript'] = cached['transcript']
+            video_info['transcript_source'] = cached['source']
+            return video_info
+        self.cache_misses += 1
+
         # Try TikTok captions first
         if video_info.get('has_captions', False):
             print(f"🔤 Attempting to extract TikTok captions for {video_id}")
-            captions = await self.scraper.get_video_captions(video_id, username)
-
-            if captions and len(captions.strip()) > 0:
+            try:
+                captions = await self.fetch_captions(video_id, username)
+            except asyncio.TimeoutError:
+                print(f"⏱️  Caption fetch for {video_id} kept timing out")
+                captions = None
+
+            # Keep the stripped text, so later checks needn't strip again
+            captions = captions.strip() if captions else ""
+            if captions:
                 print(f"✅ Got TikTok captions ({len(captions)} chars)")
                 video_info['transcript'] = captions
                 video_info['transcript_source'] = 'tiktok_captions'
+                await self.cache_transcript(video_info)
                 return video_info
 
-        # Fall back to OpusClip
-        print(f"🎬 No TikTok captions, submitting to OpusClip for {video_id}")
-        transcript = self.opus_client.get_transcript_from_video(video_url)
+        # Fall back to OpusClip; the client blocks while it polls, so run it
+        # in a thread to keep the other videos' coroutines moving
+        async with opus_semaphore or contextlib.nullcontext():
+            await self._throttle_opus()
+            print(f"🎬 No TikTok captions, submitting to OpusClip for {video_id}")
+            transcript = await asyncio.to_thread(self.opus_client.get_transcript_from_video, video_url)
 
-        if transcript and len(transcript.strip()) > 0:
+        transcript = transcript.strip() if transcript else ""
+        if transcript:
             video_info['transcript'] = transcript
             video_info['transcript_source'] = 'opusclip'
+            await self.cache_transcript(video_info)
         else:
             print(f"❌ Failed to get transcript for {video_id}")
             video_info['transcript'] = ""
@@ -54,49 +222,100 @@ class TranscriptExtractor:
 
         return video_info
 
-    async def extract_transcripts_parallel(self, videos: List[Dict], username: str, batch_size: int = 10) -> List[Dict]:
+    async def _extract_limited(self, video: Dict, username: str, caption_semaphore: asyncio.Semaphore,
+                               opus_semaphore: asyncio.Semaphore) -> Dict:
+        """
+        Extract one video's transcript within the concurrency limits.
+
+        A video with TikTok captions holds a caption slot, plus an OpusClip
+        slot if it falls back to OpusClip; any other video holds an OpusClip
+        slot throughout.
+
+        Errors are reported and recorded on the video (empty transcript,
+        source 'error') instead of raised, so callers always get the video back.
+        """
+        try:
+            if video.get('has_captions'):
+                async with caption_semaphore:
+                    return await self.extract_transcript(video, username, opus_semaphore)
+            async with opus_semaphore:
+                return await self.extract_transcript(video, username)
+        except Exception as e:
+            print(f"⚠️  Error processing video {video['video_id']}: {e}")
+            # Add video with empty transcript
+            video['transcript'] = ""
+            video['transcript_source'] = 'error'
+            return video
+
+    def _extraction_jobs(self, videos: List[Dict], username: str, concurrency: int) -> List:
+        """
+        Build one limited extraction coroutine per video, in input order.
+
+        Videos with TikTok captions share a CAPTION_CONCURRENCY limit (or
+        concurrency, if higher), so they don't queue behind OpusClip jobs;
+        every OpusClip call, including a captioned video's fallback, shares
+        the concurrency limit.
+        """
+        caption_semaphore = asyncio.Semaphore(max(concurrency, CAPTION_CONCURRENCY))
+        opus_semaphore = asyncio.Semaphore(concurrency)
+        return [self._extract_limited(video, username, caption_semaphore, opus_semaphore) for video in videos]
+
+    async def extract_transcripts_stream(self, videos: List[Dict], username: str,
+                                         concurrency: int = 10) -> AsyncIterator[Dict]:
         """
-        Extract transcripts for multiple videos in parallel batches.
+        Extract transcripts for multiple videos, yielding each video as soon
+        as its extraction finishes (in completion order), so downstream work
+        can start before the slowest video is done.
+
+        Videos without a transcript are yielded too, with source 'none' or
+        'error'.
 
         Args:
             videos: List of video metadata dictionaries
             username: TikTok username
-            batch_size: Number of videos to process in parallel (default 10)
+            concurrency: Number of OpusClip-bound videos to process in parallel (default 10)
 
-        Returns:
-            List of videos with transcripts
+        Yields:
+            Each video with its transcript and source
+        """
+        tasks = [asyncio.ensure_future(job) for job in self._extraction_jobs(videos, username, concurrency)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop the remaining extractions if the consumer stops early
+            for task in tasks:
+                task.cancel()
+
+    async def extract_transcripts_parallel(self, videos: List[Dict], username: str, batch_size: int = 10) -> List[Dict]:
         """
-        results = []
+        Extract transcripts for multiple videos in parallel.
 
-        # Process in batches
-        for i in range(0, len(videos), batch_size):
-            batch = videos[i:i + batch_size]
-            print(f"\n📦 Processing batch {i // batch_size + 1} ({len(batch)} videos)")
+        Up to batch_size OpusClip-bound videos are in flight at once (videos
+        with TikTok captions have a separate, wider limit), and each one that
+        finishes frees its slot for the next, so a slow OpusClip job never
+        leaves the other slots idle.
 
-            # Create tasks for parallel execution
-            tasks = []
-            for video in batch:
-                task = self.extract_transcript(video, username)
-                tasks.append(task)
+        Args:
+            videos: List of video metadata dictionaries
+            username: TikTok username
+            batch_size: Number of videos to process in parallel (default 10)
 
-            # Wait for all tasks in batch to complete
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+        Returns:
+            List of videos with transcripts, in input order
+        """
+        print(f"\n📦 Processing {len(videos)} videos ({batch_size} at a time)")
 
-            # Filter out exceptions and add successful results
-            for j, result in enumerate(batch_results):
-                if isinstance(result, Exception):
-                    print(f"⚠️  Error processing video {batch[j]['video_id']}: {result}")
-                    # Add video with empty transcript
-                    batch[j]['transcript'] = ""
-                    batch[j]['transcript_source'] = 'error'
-                    results.append(batch[j])
-                else:
-                    results.append(result)
+        # gather keeps input order (extract_transcripts_stream yields in
+        # completion order instead)
+        results = await asyncio.gather(*self._extraction_jobs(videos, username, batch_size))
 
-            print(f"✅ Batch {i // batch_size + 1} complete")
+        print(f"✅ Processed {len(results)} videos")
+        print(f"   ♻️  Transcript cache: {self.cache_hits} hits, {self.cache_misses} misses")
 
         # Filter out videos with no transcript (unless you want to keep them)
-        videos_with_transcripts = [v for v in results if v.get('transcript', '').strip()]
+        # Transcripts are stored stripped, so an empty one means none was found
+        videos_with_transcripts = [v for v in results if v.get('transcript')]
         skipped = len(results) - len(videos_with_transcripts)
 
         if skipped > 0:
@@ -103,6 +103,7 @@ function MainApp() {
         },
         body: JSON.stringify({
           filename: selectedFile.name,
+          fileId: fileMetadata?.fileId,
           ...config,
         }),
       });
@@ -489,6 +489,7 @@ function ResultsView({ job, onNewCreator }) {
       {selectedVideo && (
         <TranscriptModal
           video={selectedVideo}
+          csvFilename={job.csvFilename}
           onClose={() => setSelectedVideo(null)}
         />
       )}
@@ -1,11 +1,21 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { X, Copy, Download, ExternalLink } from 'lucide-react';
 
-function TranscriptModal({ video, onClose }) {
+function TranscriptModal({ video, csvFilename, onClose }) {
   const [activeTab, setActiveTab] = useState('raw');
+  const [transcript, setTranscript] = useState(video.transcript);
+
+  // Finished jobs don't carry transcripts; load this one from the CSV
+  useEffect(() => {
+    if (video.transcript || !csvFilename) return;
+    fetch(`http://localhost:8000/api/transcript/${csvFilename}/${video.id}`)
+      .then((response) => (response.ok ? response.json() : null))
+      .then((data) => data && setTranscript(data.transcript))
+      .catch((error) => console.log('Could not fetch transcript:', error));
+  }, [video, csvFilename]);
 
   const handleCopy = () => {
-    navigator.clipboard.writeText(video.transcript || '');
+    navigator.clipboard.writeText(transcript || '');
     alert('Transcript copied to clipboard!');
   };
 
@@ -75,7 +85,7 @@ function TranscriptModal({ video, onClose }) {
             {activeTab === 'raw' && (
               <div className="space-y-4">
                 <p className="text-gray-800 dark:text-gray-200 whitespace-pre-wrap leading-relaxed">
-                  {formatTranscript(video.transcript)}
+                  {formatTranscript(transcript)}
                 </p>
               </div>
             )}
@@ -172,7 +182,7 @@ function TranscriptModal({ video, onClose }) {
               <div>
                 <div className="text-gray-600 dark:text-gray-400 mb-1">User Input:</div>
                 <div className="p-3 bg-white dark:bg-gray-800 rounded border border-gray-200 dark:border-gray-700 text-gray-800 dark:text-gray-200">
-                  {`{"language": "English", "text": "${(video.transcript || '').substring(0, 50)}...", "max_char": 150}`}
+                  {`{"language": "English", "text": "${(transcript || '').substring(0, 50)}...", "max_char": 150}`}
                 </div>
               </div>
               <div>